@@ -187,6 +187,8 @@ async def register(ctx: click.Context, config_file: Path) -> None:
     except Exception as e:
         console.print(f"[red]Failed to register node: {e}[/red]")
         sys.exit(1)
+    finally:
+        await daemon_instance.db.close()
 
 
 @main.command()
@@ -217,6 +219,8 @@ async def unregister(ctx: click.Context, node_id: str) -> None:
     except Exception as e:
         console.print(f"[red]Failed to unregister node: {e}[/red]")
         sys.exit(1)
+    finally:
+        await daemon_instance.db.close()
 
 
 @main.command('list-nodes')
@@ -306,6 +310,8 @@ async def list_nodes(ctx: click.Context) -> None:
     except Exception as e:
         console.print(f"[red]Failed to list nodes: {e}[/red]")
         sys.exit(1)
+    finally:
+        await daemon_instance.db.close()
 
 
 @main.command('show-inputs')
@@ -2,7 +2,7 @@
 
 import asyncio
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
@@ -144,6 +144,21 @@ class LivingTemplatesClient:
         async with self.session.post(f"{self.base_url}/webhooks/{node_id}", json=data) as resp:
             resp.raise_for_status()
     
+    async def trigger_webhooks_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Trigger several webhook nodes in a single request.
+        
+        Args:
+            items: ``(node_id, webhook_data)`` pairs
+        """
+        data = {
+            "webhooks": [
+                {"node_id": node_id, "webhook_data": webhook_data}
+                for node_id, webhook_data in items
+            ]
+        }
+        async with self.session.post(f"{self.base_url}/webhooks", json=data) as resp:
+            resp.raise_for_status()
+    
     async def get_node_logs(self, node_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get node execution logs."""
         url = f"{self.base_url}/nodes/{node_id}/logs?limit={limit}"
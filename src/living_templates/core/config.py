@@ -1,5 +1,6 @@
 """Configuration parsing and frontmatter handling."""
 
+import os
 import re
 from pathlib import Path
 from typing import Dict, Optional, Tuple
@@ -9,6 +10,40 @@ from pydantic import ValidationError
 
 from .models import NodeConfig
 
+# libyaml's C loader is much faster; PyYAML only ships it when built against libyaml
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YAML_LOADER
+
+
+def _split_frontmatter(content: str) -> Optional[Tuple[str, str]]:
+    """Split standard frontmatter off content with plain string scans.
+    
+    Only handles the common ``---\\n...\\n---\\n`` layout, giving the same
+    result as ``FrontmatterParser.FRONTMATTER_PATTERN`` would. Anything
+    else (whitespace around the delimiters, blank lines after them, other
+    frontmatter styles) returns None and is left to the patterns.
+    
+    Returns:
+        Tuple of (frontmatter_yaml, content), or None
+    """
+    if not content.startswith('---\n'):
+        return None
+    end = content.find('\n---', 3)
+    if end <= 3 or not content.startswith('---\n', end + 1):
+        return None
+    
+    frontmatter_yaml = content[4:end]
+    template_content = content[end + 5:]
+    if not frontmatter_yaml.strip():
+        return None
+    # The pattern skips blank lines after each delimiter
+    for part in (frontmatter_yaml, template_content):
+        if '\n' in part[:len(part) - len(part.lstrip())]:
+            return None
+    return frontmatter_yaml, template_content
+
 
 class FrontmatterParser:
     """Parser for YAML frontmatter in files."""
@@ -37,10 +72,11 @@ class FrontmatterParser:
         Returns:
             Tuple of (NodeConfig, content)
         """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        try:
+            content = file_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        content = file_path.read_text(encoding='utf-8')
         return cls.parse_content(content)
     
     @classmethod
@@ -50,11 +86,15 @@ class FrontmatterParser:
         Returns:
             Tuple of (NodeConfig, content)
         """
-        # Try standard frontmatter first
-        match = cls.FRONTMATTER_PATTERN.match(content)
-        if match:
-            frontmatter_yaml = match.group(1)
-            template_content = match.group(2)
+        # Try standard frontmatter first, without a regex in the common layout
+        split = _split_frontmatter(content)
+        if split is None:
+            match = cls.FRONTMATTER_PATTERN.match(content)
+            if match:
+                split = match.group(1), match.group(2)
+        
+        if split is not None:
+            frontmatter_yaml, template_content = split
         else:
             # Try docstring frontmatter (for Python files)
             match = cls.DOCSTRING_FRONTMATTER_PATTERN.match(content)
@@ -77,7 +117,7 @@ class FrontmatterParser:
                     raise ValueError("No valid YAML frontmatter found")
         
         try:
-            frontmatter_data = yaml.safe_load(frontmatter_yaml)
+            frontmatter_data = yaml.load(frontmatter_yaml, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in frontmatter: {e}")
         
@@ -86,7 +126,7 @@ class FrontmatterParser:
             frontmatter_data['template_content'] = template_content
         
         try:
-            config = NodeConfig(**frontmatter_data)
+            config = NodeConfig.model_validate(frontmatter_data)
         except ValidationError as e:
             raise ValueError(f"Invalid node configuration: {e}")
         
@@ -106,11 +146,19 @@ class ConfigManager:
             config_dir = Path.home() / ".living-templates"
         
         self.config_dir = config_dir
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        
+        # One directory listing tells us which subdirectories already exist
+        try:
+            with os.scandir(self.config_dir) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            existing = set()
         
         # Create subdirectories
-        (self.config_dir / "store").mkdir(exist_ok=True)
-        (self.config_dir / "plugins").mkdir(exist_ok=True)
+        for name in ("store", "plugins", "jinja-cache"):
+            if name not in existing:
+                (self.config_dir / name).mkdir(exist_ok=True)
     
     @property
     def db_path(self) -> Path:
@@ -122,6 +170,11 @@ class ConfigManager:
         """Path to the content store."""
         return self.config_dir / "store"
     
+    @property
+    def template_cache_path(self) -> Path:
+        """Path to the compiled template cache."""
+        return self.config_dir / "jinja-cache"
+    
     @property
     def daemon_pid_path(self) -> Path:
         """Path to the daemon PID file."""
@@ -1,18 +1,29 @@
 """Core daemon for Living Templates."""
 
 import asyncio
+import concurrent.futures
+import functools
 import hashlib
 import json
+import logging
+import logging.handlers
 import os
+import queue
 import re
+import shutil
+import threading
 import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
 from aiohttp import web
-from watchdog.events import FileSystemEventHandler
+from pydantic import ValidationError
+from watchdog.events import EVENT_TYPE_MODIFIED, FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
 
 from .config import ConfigManager
 from .executor import ProgramExecutor
@@ -24,6 +35,24 @@ from .storage import ContentStore, Database, SymlinkManager
 from .tail_watcher import TailWatcher
 from .template_engine import TemplateEngine
 
+# Maximum number of instances of a single node rebuilt concurrently
+MAX_CONCURRENT_BUILDS = 8
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_cached(path_str: str) -> str:
+    """Resolve a path to an absolute string, memoizing the result."""
+    return os.path.realpath(path_str)
+
+
+class _PendingWrites:
+    """Database writes queued by ``LivingTemplatesDaemon._collect_writes``."""
+    
+    def __init__(self):
+        """Initialize an empty, open queue."""
+        self.rows: Dict[str, List[Any]] = {}  # batch Database method name -> rows
+        self.open = True
+
 
 class FileWatcher(FileSystemEventHandler):
     """File system event handler for watching dependencies."""
@@ -35,35 +64,113 @@ class FileWatcher(FileSystemEventHandler):
             daemon: Reference to the main daemon
         """
         self.daemon = daemon
-        self.watched_files: Dict[str, List[str]] = {}  # file_path -> [node_ids]
+        self.watched_files: Dict[str, Set[str]] = {}  # file_path -> {node_ids}
+        self._dir_watches: Dict[str, ObservedWatch] = {}  # dir_path -> watch
+        self._dir_file_counts: Dict[str, int] = {}  # dir_path -> watched files
+        self._file_hashes: Dict[str, bytes] = {}  # file_path -> last content digest
+        self._stat_cache: Dict[str, Tuple[int, int]] = {}  # file_path -> (mtime_ns, size)
+        # Guards the dicts above; the observer thread reads them while the
+        # event loop mutates them. Never held while calling into the observer,
+        # which holds its own lock while dispatching events to us.
+        self._lock = threading.Lock()
     
     def add_file_watch(self, file_path: str, node_id: str) -> None:
         """Add a file to watch for a specific node."""
-        if file_path not in self.watched_files:
-            self.watched_files[file_path] = []
-        if node_id not in self.watched_files[file_path]:
-            self.watched_files[file_path].append(node_id)
+        with self._lock:
+            is_new = file_path not in self.watched_files
+            self.watched_files.setdefault(file_path, set()).add(node_id)
+        if is_new:
+            self._watch_directory(os.path.dirname(file_path))
     
     def remove_file_watch(self, file_path: str, node_id: str) -> None:
         """Remove file watch for a specific node."""
-        if file_path in self.watched_files:
-            if node_id in self.watched_files[file_path]:
-                self.watched_files[file_path].remove(node_id)
-            if not self.watched_files[file_path]:
-                del self.watched_files[file_path]
+        with self._lock:
+            node_ids = self.watched_files.get(file_path)
+            if node_ids is None:
+                return
+            node_ids.discard(node_id)
+            if node_ids:
+                return
+            del self.watched_files[file_path]
+            self._file_hashes.pop(file_path, None)
+            self._stat_cache.pop(file_path, None)
+        self._unwatch_directory(os.path.dirname(file_path))
+    
+    def get_watched_files(self) -> Dict[str, Set[str]]:
+        """Return a snapshot of watched file paths and the nodes watching them."""
+        with self._lock:
+            return {path: set(node_ids) for path, node_ids in self.watched_files.items()}
+    
+    def _watch_directory(self, dir_path: str) -> None:
+        """Schedule a non-recursive watch on a directory containing watched files."""
+        count = self._dir_file_counts.get(dir_path, 0)
+        self._dir_file_counts[dir_path] = count + 1
+        if count == 0 and os.path.isdir(dir_path):
+            try:
+                self._dir_watches[dir_path] = self.daemon.observer.schedule(
+                    self, dir_path, recursive=False
+                )
+            except OSError:
+                # Directory doesn't exist (yet); nothing to watch
+                pass
+    
+    def _unwatch_directory(self, dir_path: str) -> None:
+        """Release a directory watch once no watched files remain in it."""
+        count = self._dir_file_counts.get(dir_path, 0) - 1
+        if count > 0:
+            self._dir_file_counts[dir_path] = count
+            return
+        
+        self._dir_file_counts.pop(dir_path, None)
+        watch = self._dir_watches.pop(dir_path, None)
+        if watch is not None:
+            try:
+                self.daemon.observer.unschedule(watch)
+            except KeyError:
+                pass
+    
+    def _content_changed(self, file_path: str) -> bool:
+        """Check whether a file's content differs from the last seen content."""
+        try:
+            # Unchanged mtime and size means unchanged content; skip the read
+            st = os.stat(file_path)
+            key = (st.st_mtime_ns, st.st_size)
+            with self._lock:
+                if self._stat_cache.get(file_path) == key:
+                    return False
+                self._stat_cache[file_path] = key
+            
+            with open(file_path, 'rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+        except OSError:
+            # Let the daemon deal with missing/unreadable files
+            return True
+        
+        with self._lock:
+            if self._file_hashes.get(file_path) == digest:
+                return False
+            self._file_hashes[file_path] = digest
+        return True
+    
+    def dispatch(self, event: FileSystemEvent) -> None:
+        """Reject events for anything other than modified watched files."""
+        if event.event_type != EVENT_TYPE_MODIFIED:
+            return
+        with self._lock:
+            is_watched = event.src_path in self.watched_files
+        if is_watched:
+            super().dispatch(event)
     
-    def on_modified(self, event) -> None:
+    def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
         if not event.is_directory:
             file_path = event.src_path
-            if file_path in self.watched_files:
+            if self._content_changed(file_path):
+                with self._lock:
+                    node_ids = list(self.watched_files.get(file_path, ()))
                 # Schedule rebuild for all nodes watching this file
-                for node_id in self.watched_files[file_path]:
-                    if self.daemon.event_loop and not self.daemon.event_loop.is_closed():
-                        asyncio.run_coroutine_threadsafe(
-                            self.daemon.handle_file_change(node_id, file_path),
-                            self.daemon.event_loop
-                        )
+                for node_id in node_ids:
+                    self.daemon.notify_file_change(node_id, file_path)
 
 
 class LivingTemplatesDaemon:
@@ -79,10 +186,16 @@ class LivingTemplatesDaemon:
         self.db = Database(self.config_manager.db_path)
         self.content_store = ContentStore(self.config_manager.store_path)
         self.symlink_manager = SymlinkManager()
-        self.template_engine = TemplateEngine()
+        self.template_engine = TemplateEngine(self.config_manager.template_cache_path)
         self.program_executor = ProgramExecutor()
         self.tail_watcher = TailWatcher()
         
+        # Thread pool for blocking render/store work
+        self._render_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=os.cpu_count(),
+            thread_name_prefix="lt-render"
+        )
+        
         # File watching
         self.file_watcher = FileWatcher(self)
         self.observer = Observer()
@@ -95,10 +208,21 @@ class LivingTemplatesDaemon:
         # Runtime state
         self.running = False
         self.node_instances: Dict[str, List[NodeInstance]] = {}  # node_id -> instances
+        self._output_hashes: Dict[str, str] = {}  # instance_id -> last published content hash
         self.event_loop = None  # Store reference to the event loop
+        self._file_events: Optional[asyncio.Queue] = None  # (node_id, file_path) from watchdog
+        self._pending_writes: ContextVar[Optional[_PendingWrites]] = ContextVar(
+            f"living_templates_writes_{id(self)}", default=None
+        )
         
         # Background tasks
         self.webhook_processor_task = None
+        self.file_event_task = None
+        
+        # Log records are written to stderr by a listener thread, off the event loop
+        self._log_handler: Optional[logging.handlers.QueueHandler] = None
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self._saved_log_level = logging.NOTSET
     
     async def initialize(self) -> None:
         """Initialize the daemon."""
@@ -114,14 +238,26 @@ class LivingTemplatesDaemon:
         
         await self.initialize()
         
+        # Route package logging through a queue so handlers never block the loop
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._log_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+        package_logger = logging.getLogger("living_templates")
+        # Without a level the logger inherits root's WARNING and INFO never reaches the queue
+        self._saved_log_level = package_logger.level
+        package_logger.setLevel(logging.INFO)
+        package_logger.addHandler(self._log_handler)
+        self._log_listener.start()
+        
         # Store reference to the current event loop
         self.event_loop = asyncio.get_running_loop()
+        self._file_events = asyncio.Queue()
+        self.file_event_task = asyncio.create_task(self._process_file_events())
         
         # Start API server
         await self._start_api_server()
         
-        # Start file watching
-        self.observer.schedule(self.file_watcher, "/", recursive=True)
+        # Start file watching (directories are scheduled per watched file)
         self.observer.start()
         
         # Start tail watcher
@@ -144,12 +280,13 @@ class LivingTemplatesDaemon:
         self.running = False
         
         # Stop background tasks
-        if self.webhook_processor_task:
-            self.webhook_processor_task.cancel()
-            try:
-                await self.webhook_processor_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.webhook_processor_task, self.file_event_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         # Stop tail watcher
         await self.tail_watcher.stop_watching()
@@ -162,6 +299,20 @@ class LivingTemplatesDaemon:
         self.observer.stop()
         self.observer.join()
         
+        # Release render threads
+        self._render_pool.shutdown(wait=False)
+        
+        # Close the database connection
+        await self.db.close()
+        
+        # Flush queued log records
+        if self._log_listener:
+            package_logger = logging.getLogger("living_templates")
+            package_logger.removeHandler(self._log_handler)
+            package_logger.setLevel(self._saved_log_level)
+            self._log_listener.stop()
+            self._log_handler = self._log_listener = None
+        
         # Remove PID file
         pid_file = self.config_manager.daemon_pid_path
         if pid_file.exists():
@@ -176,8 +327,8 @@ class LivingTemplatesDaemon:
         Returns:
             Node ID
         """
-        # Parse configuration
-        config, content = self.config_manager.load_node_config(config_path)
+        # Parse configuration off the event loop
+        config, content = await self._run_blocking(self.config_manager.load_node_config, config_path)
         
         # Generate node ID from config path
         node_id = self._generate_node_id(config_path)
@@ -200,34 +351,60 @@ class LivingTemplatesDaemon:
         
         return node_id
     
-    async def unregister_node(self, node_id: str) -> None:
-        """Unregister a node.
+    async def register_nodes(self, config_paths: List[Path]) -> List[str]:
+        """Register several nodes concurrently.
+        
+        Config files are read and parsed in parallel; a bounded number of
+        registrations is in flight at a time.
         
         Args:
-            node_id: ID of the node to unregister
+            config_paths: Paths to the configuration files
+            
+        Returns:
+            Node IDs, in the order of ``config_paths``
         """
-        # Get node info before removing
-        node = await self.db.get_node(node_id)
+        semaphore = asyncio.Semaphore(min(32, (os.cpu_count() or 4) * 4))
         
-        # Remove all instances
-        if node_id in self.node_instances:
-            for instance in self.node_instances[node_id]:
-                await self._remove_instance(instance)
-            del self.node_instances[node_id]
+        async def register_one(config_path: Path) -> str:
+            async with semaphore:
+                return await self.register_node(config_path)
         
-        # Remove config file watch
-        if node and node.config_path:
-            self.file_watcher.remove_file_watch(str(node.config_path.resolve()), node_id)
+        return list(await asyncio.gather(*(register_one(path) for path in config_paths)))
+    
+    async def unregister_node(self, node_id: str) -> None:
+        """Unregister a node.
         
-        # Remove tail watchers
-        if node and node.config.node_type == NodeType.TAIL:
-            for input_spec in node.config.inputs.values():
-                if input_spec.type.value == "file":
-                    # Remove from tail watcher
-                    pass  # TailWatcher will clean up automatically
+        Args:
+            node_id: ID of the node to unregister
+        """
+        # Commit all instance and node removals together
+        async with self.db.transaction():
+            # Get node info before removing
+            node = await self.db.get_node(node_id)
+            
+            # Remove all instances
+            if node_id in self.node_instances:
+                for instance in self.node_instances[node_id]:
+                    await self._remove_instance(instance, node)
+                del self.node_instances[node_id]
+            
+            # Remove config file watch
+            if node and node.config_path:
+                self.file_watcher.remove_file_watch(_resolve_cached(str(node.config_path)), node_id)
+            
+            # Remove tail watchers
+            if node and node.config.node_type == NodeType.TAIL:
+                for input_spec in node.config.inputs.values():
+                    if input_spec.type.value == "file":
+                        # Remove from tail watcher
+                        pass  # TailWatcher will clean up automatically
+            
+            # Remove from database
+            await self.db.remove_node(node_id)
+        self.program_executor.invalidate(node_id)
         
-        # Remove from database
-        await self.db.remove_node(node_id)
+        # Watched path set changed; drop memoized resolutions
+        _resolve_cached.cache_clear()
         
         # Log unregistration
         await self._log(node_id, LogLevel.INFO, "Node unregistered")
@@ -286,11 +463,50 @@ class LivingTemplatesDaemon:
         if not node:
             return
         
-        if node_id in self.node_instances:
-            for instance in self.node_instances[node_id]:
-                await self._build_instance(node, instance)
+        await self._rebuild_instances(node)
+    
+    async def _rebuild_instances(self, node: TemplateNode) -> None:
+        """Rebuild all instances of a node that is already loaded.
+        
+        Args:
+            node: The node to rebuild
+        """
+        if node.id in self.node_instances:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_BUILDS)
+            
+            async def build(instance: NodeInstance) -> None:
+                async with semaphore:
+                    await self._build_instance(node, instance)
+            
+            await asyncio.gather(*(build(instance) for instance in list(self.node_instances[node.id])))
+        
+        await self._log(node.id, LogLevel.INFO, "Node instances rebuilt")
+    
+    def notify_file_change(self, node_id: str, file_path: str) -> None:
+        """Queue a file change for processing on the event loop.
         
-        await self._log(node_id, LogLevel.INFO, "Node instances rebuilt")
+        Safe to call from the watchdog observer thread.
+        
+        Args:
+            node_id: ID of the node that watches the file
+            file_path: Path of the changed file
+        """
+        if self.event_loop and not self.event_loop.is_closed() and self._file_events is not None:
+            self.event_loop.call_soon_threadsafe(self._file_events.put_nowait, (node_id, file_path))
+    
+    async def _process_file_events(self) -> None:
+        """Background task that drains queued file changes in batches."""
+        while True:
+            batch = [await self._file_events.get()]
+            while not self._file_events.empty():
+                batch.append(self._file_events.get_nowait())
+            
+            # Collapse repeated events for the same node and file
+            for node_id, file_path in dict.fromkeys(batch):
+                try:
+                    await self.handle_file_change(node_id, file_path)
+                except Exception as e:
+                    await self._log(node_id, LogLevel.ERROR, f"File change handling failed: {e}")
     
     async def handle_file_change(self, node_id: str, file_path: str) -> None:
         """Handle a file change event.
@@ -303,23 +519,22 @@ class LivingTemplatesDaemon:
         
         # Check if it's the config file itself
         node = await self.db.get_node(node_id)
-        if node and node.config_path and str(node.config_path) == file_path:
+        if node and node.config_path and _resolve_cached(str(node.config_path)) == file_path:
             # For program nodes, if the config file is the script file, we should reload but be careful about loops
             if node.config.node_type == NodeType.PROGRAM and node.config.script_path:
-                script_path = Path(node.config.script_path)
-                if not script_path.is_absolute():
-                    script_path = Path.cwd() / script_path
-                
                 # If the config file is the same as the script file, avoid reload during execution
-                if str(script_path.resolve()) == str(Path(file_path).resolve()):
+                # (relative script paths resolve against the working directory)
+                if _resolve_cached(node.config.script_path) == file_path:
                     await self._log(node_id, LogLevel.DEBUG, "Ignoring script file change during execution to prevent loops")
                     return
             
-            # Config file changed, reload node
+            # Config file changed, reload node and rebuild its instances
             try:
-                await self.unregister_node(node_id)
-                await self.register_node(node.config_path)
-                await self._log(node_id, LogLevel.INFO, "Node reloaded due to config change")
+                reloaded = await self._reload_node(node)
+                if reloaded:
+                    await self._log(node_id, LogLevel.INFO, "Node reloaded due to config change")
+                else:
+                    await self._log(node_id, LogLevel.DEBUG, "Config unchanged, skipping reload")
             except Exception as e:
                 await self._log(node_id, LogLevel.ERROR, f"Failed to reload node: {e}")
             return
@@ -327,6 +542,44 @@ class LivingTemplatesDaemon:
         # Rebuild node instances that depend on this file
         await self.rebuild_node_instances(node_id)
     
+    async def _reload_node(self, node: TemplateNode) -> bool:
+        """Re-read a node's configuration file and rebuild its instances.
+        
+        The node row and everything the rebuild stores are committed in one
+        transaction once all instances are built.
+        
+        Args:
+            node: The node whose configuration file changed
+            
+        Returns:
+            False if the parsed config is unchanged and nothing was rebuilt
+        """
+        config, content = await self._run_blocking(self.config_manager.load_node_config, node.config_path)
+        if config.config_hash == node.config.config_hash:
+            return False
+        
+        self.program_executor.invalidate(node.id)
+        
+        reloaded = TemplateNode(
+            id=node.id,
+            config=config,
+            config_path=node.config_path,
+            created_at=node.created_at
+        )
+        
+        async with self._collect_writes():
+            await self._write('store_nodes', [reloaded])
+            
+            # Inputs may have changed, so replace watchers and cached paths before rebuilding
+            await self._unwatch_node(node.id)
+            await self._setup_node_watchers(reloaded)
+            for instance in self.node_instances.get(node.id, []):
+                instance.resolved_file_inputs.clear()
+                await self._setup_file_watching(reloaded, instance)
+            
+            await self._rebuild_instances(reloaded)
+        return True
+    
     async def handle_tail_change(self, node_id: str, new_lines: List[str]) -> None:
         """Handle new lines from tail watcher.
         
@@ -367,11 +620,11 @@ class LivingTemplatesDaemon:
                 if node.config.output_mode == OutputMode.APPEND:
                     content = "\n".join(new_lines) + "\n"
                     target_path = Path(instance.output_path)
-                    self.symlink_manager.append_to_file(target_path, content)
+                    await self._run_blocking(self.symlink_manager.append_to_file, target_path, content)
                 elif node.config.output_mode == OutputMode.PREPEND:
                     content = "\n".join(new_lines) + "\n"
                     target_path = Path(instance.output_path)
-                    self.symlink_manager.prepend_to_file(target_path, content)
+                    await self._run_blocking(self.symlink_manager.prepend_to_file, target_path, content)
                 # For other modes, would need template processing
     
     async def trigger_webhook(self, node_id: str, webhook_data: Dict[str, Any]) -> None:
@@ -390,6 +643,32 @@ class LivingTemplatesDaemon:
         await self.db.store_webhook_trigger(trigger)
         await self._log(node_id, LogLevel.INFO, "Webhook triggered")
     
+    async def trigger_webhooks(self, items: List[Dict[str, Any]]) -> None:
+        """Trigger several webhook nodes at once.
+        
+        Args:
+            items: Entries with ``node_id`` and ``webhook_data`` keys
+            
+        Raises:
+            ValueError: If an entry is malformed; nothing is stored then
+        """
+        try:
+            triggers = [
+                WebhookTrigger(
+                    node_id=item["node_id"],
+                    data=item["webhook_data"].get("data", {}),
+                    headers=item["webhook_data"].get("headers", {})
+                )
+                for item in items
+            ]
+        except (KeyError, TypeError, AttributeError, ValidationError) as e:
+            raise ValueError(f"Invalid webhook: {e}")
+        
+        async with self.db.transaction():
+            await self.db.store_webhook_triggers(triggers)
+            for trigger in triggers:
+                await self._log(trigger.node_id, LogLevel.INFO, "Webhook triggered")
+    
     async def get_status(self) -> Dict[str, Any]:
         """Get daemon status."""
         nodes = await self.db.list_nodes()
@@ -434,7 +713,7 @@ class LivingTemplatesDaemon:
         if node_id:
             # Get files watched by specific node
             watched_files = []
-            for file_path, watching_nodes in self.file_watcher.watched_files.items():
+            for file_path, watching_nodes in self.file_watcher.get_watched_files().items():
                 if node_id in watching_nodes:
                     watched_files.append({
                         "file_path": file_path,
@@ -448,9 +727,9 @@ class LivingTemplatesDaemon:
         else:
             # Get all watched files
             all_watched = {}
-            for file_path, watching_nodes in self.file_watcher.watched_files.items():
+            for file_path, watching_nodes in self.file_watcher.get_watched_files().items():
                 all_watched[file_path] = {
-                    "watching_nodes": watching_nodes,
+                    "watching_nodes": sorted(watching_nodes),
                     "exists": Path(file_path).exists()
                 }
             
@@ -474,8 +753,9 @@ class LivingTemplatesDaemon:
             raise ValueError(f"Node not found: {node_id}")
         
         file_inputs = []
+        file_input_names = node.config.file_input_names
         for input_name, input_spec in node.config.inputs.items():
-            if input_spec.type.value == "file":
+            if input_name in file_input_names:
                 file_inputs.append({
                     "input_name": input_name,
                     "description": input_spec.description,
@@ -543,22 +823,38 @@ class LivingTemplatesDaemon:
         except ValueError:
             path_str = str(config_path)
         
-        return hashlib.md5(path_str.encode()).hexdigest()[:12]
+        return hashlib.blake2b(path_str.encode(), digest_size=6).hexdigest()
     
     async def _load_existing_state(self) -> None:
         """Load existing nodes and instances from database."""
         nodes = await self.db.list_nodes()
+        nodes_by_id = {node.id: node for node in nodes}
+        
+        # Fetch every instance in one query and group by node
+        for instance in await self.db.get_node_instances():
+            if instance.node_id in nodes_by_id:
+                self.node_instances.setdefault(instance.node_id, []).append(instance)
+        
+        # Restore file watches from the persisted index, no path resolution needed
+        restored = set()
+        for file_path, node_id in await self.db.get_watches():
+            if node_id in nodes_by_id:
+                self.file_watcher.add_file_watch(file_path, node_id)
+                restored.add(node_id)
         
         for node in nodes:
-            instances = await self.db.get_node_instances(node.id)
-            self.node_instances[node.id] = instances
+            instances = self.node_instances.setdefault(node.id, [])
             
-            # Set up file watching for existing instances
-            for instance in instances:
-                await self._setup_file_watching(node, instance)
-            
-            # Set up node-specific watchers
-            await self._setup_node_watchers(node)
+            if node.id not in restored:
+                # No persisted watches (e.g. a database from before the index
+                # existed); set them up from the config and rebuild the index
+                await self._setup_node_watchers(node)
+                for instance in instances:
+                    await self._setup_file_watching(node, instance)
+            elif node.config.input_mode == InputMode.TAIL:
+                # Tail watches are not persisted; set them up per instance
+                for instance in instances:
+                    await self._setup_file_watching(node, instance)
     
     async def _setup_node_watchers(self, node: TemplateNode) -> None:
         """Set up watchers specific to node type."""
@@ -572,15 +868,16 @@ class LivingTemplatesDaemon:
                         script_path = Path.cwd() / script_path
                     
                     # Only watch config file if it's different from script file
-                    if str(node.config_path.resolve()) != str(script_path.resolve()):
-                        self.file_watcher.add_file_watch(str(node.config_path.resolve()), node.id)
+                    config_path = _resolve_cached(str(node.config_path))
+                    if config_path != _resolve_cached(str(script_path)):
+                        await self._watch_files(node.id, [config_path])
                 else:
                     # No script path, so watch config file
-                    self.file_watcher.add_file_watch(str(node.config_path.resolve()), node.id)
+                    await self._watch_files(node.id, [_resolve_cached(str(node.config_path))])
         else:
             # For non-program nodes, watch the config file normally
             if node.config_path and node.config_path.exists():
-                self.file_watcher.add_file_watch(str(node.config_path.resolve()), node.id)
+                await self._watch_files(node.id, [_resolve_cached(str(node.config_path))])
         
         # Set up node-type specific watching
         if node.config.node_type == NodeType.TAIL and node.config.input_mode == InputMode.TAIL:
@@ -593,11 +890,12 @@ class LivingTemplatesDaemon:
     async def _setup_file_watching(self, node: TemplateNode, instance: NodeInstance) -> None:
         """Set up file watching for a node instance."""
         # Watch file inputs
+        file_input_names = node.config.file_input_names
+        watched = []
         for input_name, input_value in instance.input_values.items():
-            input_spec = node.config.inputs.get(input_name)
-            if input_spec and input_spec.type.value == "file":
+            if input_name in file_input_names:
                 if isinstance(input_value, str):
-                    file_path = str(Path(input_value).resolve())
+                    file_path = _resolve_cached(input_value)
                     
                     if node.config.input_mode == InputMode.TAIL:
                         # Set up tail watching
@@ -609,7 +907,77 @@ class LivingTemplatesDaemon:
                         )
                     else:
                         # Regular file watching
-                        self.file_watcher.add_file_watch(file_path, node.id)
+                        watched.append(file_path)
+        
+        await self._watch_files(node.id, watched)
+    
+    async def _watch_files(self, node_id: str, file_paths: List[str]) -> None:
+        """Watch resolved file paths for a node and persist the watches.
+        
+        Args:
+            node_id: ID of the node watching the files
+            file_paths: Resolved paths of the files to watch
+        """
+        for file_path in file_paths:
+            self.file_watcher.add_file_watch(file_path, node_id)
+        await self._write('store_watches', [(file_path, node_id) for file_path in file_paths])
+    
+    async def _unwatch_node(self, node_id: str) -> None:
+        """Stop watching every file a node watches and drop the persisted watches.
+        
+        Args:
+            node_id: ID of the node
+        """
+        watches = [
+            (file_path, node_id)
+            for file_path, node_ids in self.file_watcher.get_watched_files().items()
+            if node_id in node_ids
+        ]
+        for file_path, _ in watches:
+            self.file_watcher.remove_file_watch(file_path, node_id)
+        await self._write('remove_watches', watches)
+    
+    async def _write(self, method: str, rows: List[Any]) -> None:
+        """Store rows with a batch ``Database`` method.
+        
+        Inside ``_collect_writes`` the rows are queued instead.
+        
+        Args:
+            method: Name of the batch method, e.g. ``'store_node_values'``
+            rows: Rows to pass to it
+        """
+        pending = self._pending_writes.get()
+        if pending is not None and pending.open:
+            pending.rows.setdefault(method, []).extend(rows)
+        else:
+            await getattr(self.db, method)(rows)
+    
+    @asynccontextmanager
+    async def _collect_writes(self) -> AsyncIterator[None]:
+        """Queue database writes made inside the block and commit them together.
+        
+        Rendering and program execution inside the block run without holding
+        the database lock; the queued writes are committed in one short
+        transaction when the block exits, and dropped if it raises. Nested
+        calls join the outer block.
+        """
+        outer = self._pending_writes.get()
+        if outer is not None and outer.open:
+            yield
+            return
+        
+        pending = _PendingWrites()
+        token = self._pending_writes.set(pending)
+        try:
+            yield
+        finally:
+            # Tasks spawned inside the block write directly from now on
+            pending.open = False
+            self._pending_writes.reset(token)
+        
+        async with self.db.transaction():
+            for method, rows in pending.rows.items():
+                await getattr(self.db, method)(rows)
     
     async def _build_instance(self, node: TemplateNode, instance: NodeInstance) -> None:
         """Build/rebuild an instance.
@@ -635,7 +1003,7 @@ class LivingTemplatesDaemon:
             # Update instance metadata
             instance.last_built = datetime.now()
             instance.build_count += 1
-            await self.db.store_node_instance(instance)
+            await self._write('store_node_instances', [instance])
             
         except Exception as e:
             await self._log(node.id, LogLevel.ERROR, f"Build failed for instance {instance.id}: {e}")
@@ -645,45 +1013,95 @@ class LivingTemplatesDaemon:
         """Build a template instance."""
         # Resolve input values
         context = await self._resolve_input_values(node, instance)
-        
-        # Render template
-        rendered_content = self.template_engine.render(
-            node.config.template_content or "",
-            context
-        )
+        template_content = node.config.template_content or ""
+        loop = asyncio.get_running_loop()
         
         # Handle output mode
         target_path = Path(instance.output_path)
         
         if node.config.output_mode == OutputMode.REPLACE:
-            # Store content and create symlink
-            content_hash, content_path = self.content_store.store_content(rendered_content)
-            self.symlink_manager.create_symlink(target_path, content_path)
+            # Render and store content off the event loop
+            rendered_content, content_hash, content_path = await loop.run_in_executor(
+                self._render_pool, self._render_and_store, template_content, context
+            )
+            
+            # Skip storing node values if the output is identical to the last build
+            if not await self._publish_content(instance, target_path, content_hash, content_path):
+                return
             
-            # Store symlink info
-            await self.db.store_symlink(
-                str(target_path),
-                content_hash,
-                instance.id
+            # The store hash already identifies the content
+            value_hash = content_hash
+        else:
+            rendered_content = await loop.run_in_executor(
+                self._render_pool, self.template_engine.render, template_content, context
             )
-        elif node.config.output_mode == OutputMode.APPEND:
-            self.symlink_manager.append_to_file(target_path, rendered_content)
-        elif node.config.output_mode == OutputMode.PREPEND:
-            self.symlink_manager.prepend_to_file(target_path, rendered_content)
-        elif node.config.output_mode == OutputMode.CONCATENATE:
-            # For concatenate, we append but with some separator logic
-            separator = "\n" if not rendered_content.endswith("\n") else ""
-            self.symlink_manager.append_to_file(target_path, separator + rendered_content)
+            
+            if node.config.output_mode == OutputMode.APPEND:
+                await self._run_blocking(self.symlink_manager.append_to_file, target_path, rendered_content)
+            elif node.config.output_mode == OutputMode.PREPEND:
+                await self._run_blocking(self.symlink_manager.prepend_to_file, target_path, rendered_content)
+            elif node.config.output_mode == OutputMode.CONCATENATE:
+                # For concatenate, we append but with some separator logic
+                separator = "\n" if not rendered_content.endswith("\n") else ""
+                await self._run_blocking(self.symlink_manager.append_to_file, target_path, separator + rendered_content)
+            
+            value_hash = self.content_store.hash_content(rendered_content)
         
         # Store node values
-        for output_name in node.config.outputs:
-            value = NodeValue(
+        await self._write('store_node_values', [
+            NodeValue(
                 node_id=node.id,
                 output_name=output_name,
-                value_hash=hashlib.md5(rendered_content.encode()).hexdigest(),
+                value_hash=value_hash,
                 value_data=rendered_content
             )
-            await self.db.store_node_value(value)
+            for output_name in node.config.outputs
+        ])
+    
+    async def _publish_content(
+        self,
+        instance: NodeInstance,
+        target_path: Path,
+        content_hash: str,
+        content_path: Path
+    ) -> bool:
+        """Point an instance's output symlink at stored content.
+        
+        Args:
+            instance: The instance being published
+            target_path: Output path of the instance
+            content_hash: Hash of the stored content
+            content_path: Path of the stored content
+            
+        Returns:
+            False if the output already pointed at this content, True otherwise
+        """
+        if (self._output_hashes.get(instance.id) == content_hash
+                and self.symlink_manager.points_to(target_path, content_path)):
+            return False
+        
+        await self._run_blocking(self.symlink_manager.create_symlink, target_path, content_path)
+        
+        # Store symlink info
+        await self._write('store_symlinks', [(str(target_path), content_hash, instance.id)])
+        self._output_hashes[instance.id] = content_hash
+        return True
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking render or filesystem work in the render thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._render_pool, func, *args)
+    
+    def _render_and_store(self, template_content: str, context: Dict[str, Any]) -> Tuple[str, str, Path]:
+        """Render a template and store the result in the content store.
+        
+        Runs in the render thread pool.
+        
+        Returns:
+            Tuple of (rendered_content, content_hash, content_path)
+        """
+        rendered_content = self.template_engine.render(template_content, context)
+        content_hash, content_path = self.content_store.store_content(rendered_content)
+        return rendered_content, content_hash, content_path
     
     async def _build_program_instance(self, node: TemplateNode, instance: NodeInstance) -> None:
         """Build a program instance."""
@@ -694,8 +1112,7 @@ class LivingTemplatesDaemon:
         output_files, logs = await self.program_executor.execute_program(node, instance, input_values)
         
         # Store execution logs
-        for log in logs:
-            await self.db.store_execution_log(log)
+        await self._write('store_execution_logs', logs)
         
         # Handle output files
         target_path = Path(instance.output_path)
@@ -704,65 +1121,41 @@ class LivingTemplatesDaemon:
             # Single output file
             output_file = Path(output_files[0])
             if output_file.exists():
-                content = output_file.read_text(encoding='utf-8')
+                data = await self._run_blocking(output_file.read_bytes)
                 
                 if node.config.output_mode == OutputMode.REPLACE:
-                    content_hash, content_path = self.content_store.store_content(content)
-                    self.symlink_manager.create_symlink(target_path, content_path)
-                    await self.db.store_symlink(str(target_path), content_hash, instance.id)
+                    # Stored as-is, without a decode/encode round trip
+                    content_hash, content_path = await self._run_blocking(
+                        self.content_store.store_content, data
+                    )
+                    await self._publish_content(instance, target_path, content_hash, content_path)
                 elif node.config.output_mode == OutputMode.APPEND:
-                    self.symlink_manager.append_to_file(target_path, content)
+                    await self._run_blocking(self.symlink_manager.append_to_file, target_path, data.decode('utf-8'))
                 elif node.config.output_mode == OutputMode.PREPEND:
-                    self.symlink_manager.prepend_to_file(target_path, content)
+                    await self._run_blocking(self.symlink_manager.prepend_to_file, target_path, data.decode('utf-8'))
                 elif node.config.output_mode == OutputMode.CONCATENATE:
+                    content = data.decode('utf-8')
                     separator = "\n" if not content.endswith("\n") else ""
-                    self.symlink_manager.append_to_file(target_path, separator + content)
+                    await self._run_blocking(self.symlink_manager.append_to_file, target_path, separator + content)
         elif len(output_files) > 1:
             # Multiple output files - copy to output directory
-            target_path.mkdir(parents=True, exist_ok=True)
-            for output_file in output_files:
-                src_path = Path(output_file)
-                if src_path.exists():
-                    dst_path = target_path / src_path.name
-                    # Handle different output modes for multiple files
-                    content = src_path.read_text(encoding='utf-8')
-                    if node.config.output_mode == OutputMode.REPLACE:
-                        dst_path.write_text(content, encoding='utf-8')
-                    elif node.config.output_mode == OutputMode.APPEND:
-                        if dst_path.exists():
-                            existing_content = dst_path.read_text(encoding='utf-8')
-                            dst_path.write_text(existing_content + content, encoding='utf-8')
-                        else:
-                            dst_path.write_text(content, encoding='utf-8')
-                    elif node.config.output_mode == OutputMode.PREPEND:
-                        if dst_path.exists():
-                            existing_content = dst_path.read_text(encoding='utf-8')
-                            dst_path.write_text(content + existing_content, encoding='utf-8')
-                        else:
-                            dst_path.write_text(content, encoding='utf-8')
-                    elif node.config.output_mode == OutputMode.CONCATENATE:
-                        separator = "\n" if not content.endswith("\n") else ""
-                        if dst_path.exists():
-                            existing_content = dst_path.read_text(encoding='utf-8')
-                            dst_path.write_text(existing_content + separator + content, encoding='utf-8')
-                        else:
-                            dst_path.write_text(content, encoding='utf-8')
+            await self._run_blocking(
+                self._copy_output_files, output_files, target_path, node.config.output_mode
+            )
         
         # Store node values for outputs that were generated
-        stored_values = 0
+        values = []
         for i, output_name in enumerate(node.config.outputs):
             if i < len(output_files):
                 output_file = Path(output_files[i])
                 if output_file.exists():
-                    content = output_file.read_text(encoding='utf-8')
-                    value = NodeValue(
+                    content = await self._run_blocking(output_file.read_text, 'utf-8')
+                    values.append(NodeValue(
                         node_id=node.id,
                         output_name=output_name,
-                        value_hash=hashlib.md5(content.encode()).hexdigest(),
+                        value_hash=self.content_store.hash_content(content),
                         value_data=content
-                    )
-                    await self.db.store_node_value(value)
-                    stored_values += 1
+                    ))
                     
                     # Clean up the persistent temporary file
                     try:
@@ -770,7 +1163,50 @@ class LivingTemplatesDaemon:
                     except Exception as e:
                         await self._log(node.id, LogLevel.DEBUG, f"Failed to cleanup temp file {output_file}: {e}")
         
-        await self._log(node.id, LogLevel.INFO, f"Program instance completed: {stored_values} outputs stored")
+        await self._write('store_node_values', values)
+        
+        await self._log(node.id, LogLevel.INFO, f"Program instance completed: {len(values)} outputs stored")
+    
+    def _copy_output_files(self, output_files: List[str], target_path: Path, output_mode: OutputMode) -> None:
+        """Copy multiple program output files into an output directory.
+        
+        Runs in the render thread pool.
+        
+        Args:
+            output_files: Paths of the files the program produced
+            target_path: Output directory of the instance
+            output_mode: How each file is combined with an existing copy
+        """
+        target_path.mkdir(parents=True, exist_ok=True)
+        for output_file in output_files:
+            src_path = Path(output_file)
+            if src_path.exists():
+                dst_path = target_path / src_path.name
+                # Replacing and appending copy raw bytes without decoding them;
+                # shutil.copyfile uses sendfile on Linux
+                if output_mode == OutputMode.REPLACE:
+                    shutil.copyfile(src_path, dst_path)
+                    continue
+                if output_mode == OutputMode.APPEND:
+                    with open(src_path, 'rb') as src, open(dst_path, 'ab') as dst:
+                        shutil.copyfileobj(src, dst)
+                    continue
+                
+                # Handle different output modes for multiple files
+                content = src_path.read_text(encoding='utf-8')
+                if output_mode == OutputMode.PREPEND:
+                    if dst_path.exists():
+                        existing_content = dst_path.read_text(encoding='utf-8')
+                        dst_path.write_text(content + existing_content, encoding='utf-8')
+                    else:
+                        dst_path.write_text(content, encoding='utf-8')
+                elif output_mode == OutputMode.CONCATENATE:
+                    separator = "\n" if not content.endswith("\n") else ""
+                    if dst_path.exists():
+                        existing_content = dst_path.read_text(encoding='utf-8')
+                        dst_path.write_text(existing_content + separator + content, encoding='utf-8')
+                    else:
+                        dst_path.write_text(content, encoding='utf-8')
     
     async def _build_webhook_instance(self, node: TemplateNode, instance: NodeInstance) -> None:
         """Build a webhook instance - essentially sets it up to receive triggers."""
@@ -791,6 +1227,7 @@ class LivingTemplatesDaemon:
     ) -> Dict[str, Any]:
         """Resolve input values for an instance, including node references."""
         context = {}
+        file_input_names = node.config.file_input_names
         
         for input_name, input_spec in node.config.inputs.items():
             if input_name in instance.input_values:
@@ -812,12 +1249,12 @@ class LivingTemplatesDaemon:
                 raise ValueError(f"Required input '{input_name}' not provided")
             
             # Handle file inputs
-            if input_spec.type.value == "file" and isinstance(value, str):
-                file_path = Path(value)
-                if file_path.exists():
-                    context[input_name] = str(file_path.resolve())
-                else:
-                    context[input_name] = value
+            if input_name in file_input_names and isinstance(value, str):
+                resolved = instance.resolved_file_inputs.get(value)
+                if resolved is None and os.path.exists(value):
+                    # Only cache existing files so a missing file is picked up once created
+                    resolved = instance.resolved_file_inputs[value] = _resolve_cached(value)
+                context[input_name] = resolved if resolved is not None else value
             else:
                 context[input_name] = value
         
@@ -864,23 +1301,34 @@ class LivingTemplatesDaemon:
         
         return dependencies
     
-    async def _remove_instance(self, instance: NodeInstance) -> None:
-        """Remove an instance and clean up."""
+    async def _remove_instance(self, instance: NodeInstance, node: Optional[TemplateNode] = None) -> None:
+        """Remove an instance and clean up.
+        
+        Args:
+            instance: The instance to remove
+            node: The instance's node, if already loaded by the caller
+        """
         # Remove symlink
         target_path = Path(instance.output_path)
-        self.symlink_manager.remove_symlink(target_path)
+        await self._run_blocking(self.symlink_manager.remove_symlink, target_path)
+        self._output_hashes.pop(instance.id, None)
         
         # Remove from file watching
-        node = await self.db.get_node(instance.node_id)
+        if node is None:
+            node = await self.db.get_node(instance.node_id)
         if node:
+            file_input_names = node.config.file_input_names
+            unwatched = []
             for input_name, input_value in instance.input_values.items():
-                input_spec = node.config.inputs.get(input_name)
-                if input_spec and input_spec.type.value == "file":
+                if input_name in file_input_names:
                     if isinstance(input_value, str):
+                        file_path = _resolve_cached(input_value)
                         if node.config.input_mode == InputMode.TAIL:
-                            self.tail_watcher.remove_file_watch(instance.node_id, input_value)
+                            self.tail_watcher.remove_file_watch(instance.node_id, file_path)
                         else:
-                            self.file_watcher.remove_file_watch(input_value, node.id)
+                            self.file_watcher.remove_file_watch(file_path, node.id)
+                            unwatched.append((file_path, node.id))
+            await self._write('remove_watches', unwatched)
     
     async def _process_webhooks(self) -> None:
         """Background task to process webhook triggers."""
@@ -919,7 +1367,8 @@ class LivingTemplatesDaemon:
                 
                 # If it's a template webhook, render it
                 if node.config.template_content:
-                    rendered_content = self.template_engine.render(
+                    rendered_content = await self._run_blocking(
+                        self.template_engine.render,
                         node.config.template_content,
                         context
                     )
@@ -927,19 +1376,19 @@ class LivingTemplatesDaemon:
                     # Handle output
                     target_path = Path(instance.output_path)
                     if node.config.output_mode == OutputMode.APPEND:
-                        self.symlink_manager.append_to_file(target_path, rendered_content)
+                        await self._run_blocking(self.symlink_manager.append_to_file, target_path, rendered_content)
                     elif node.config.output_mode == OutputMode.PREPEND:
-                        self.symlink_manager.prepend_to_file(target_path, rendered_content)
+                        await self._run_blocking(self.symlink_manager.prepend_to_file, target_path, rendered_content)
                     else:
-                        content_hash, content_path = self.content_store.store_content(rendered_content)
-                        self.symlink_manager.create_symlink(target_path, content_path)
-                        await self.db.store_symlink(str(target_path), content_hash, instance.id)
+                        content_hash, content_path = await self._run_blocking(
+                            self.content_store.store_content, rendered_content
+                        )
+                        await self._publish_content(instance, target_path, content_hash, content_path)
                 
                 await self._log(trigger.node_id, LogLevel.INFO, f"Webhook processed for instance: {instance.id}")
         
         # Mark trigger as processed
-        trigger_id = trigger.node_id + "_" + str(int(trigger.timestamp.timestamp() * 1000))
-        await self.db.mark_webhook_processed(trigger_id)
+        await self.db.mark_webhook_processed(trigger.id)
     
     async def _log(self, node_id: str, level: LogLevel, message: str, details: Optional[Dict[str, Any]] = None) -> None:
         """Log a message for a node."""
@@ -950,7 +1399,7 @@ class LivingTemplatesDaemon:
             message=message,
             details=details
         )
-        await self.db.store_execution_log(log)
+        await self._write('store_execution_logs', [log])
     
     async def _start_api_server(self) -> None:
         """Start the HTTP API server."""
@@ -971,6 +1420,7 @@ class LivingTemplatesDaemon:
         self.app.router.add_get('/api/watched-files', self._api_get_watched_files)
         self.app.router.add_get('/api/watched-files/{node_id}', self._api_get_watched_files_for_node)
         self.app.router.add_get('/api/graph', self._api_get_dependency_graph)
+        self.app.router.add_post('/api/webhooks', self._api_trigger_webhooks)
         self.app.router.add_post('/api/webhooks/{node_id}', self._api_trigger_webhook)
         
         # Start server
@@ -1032,7 +1482,7 @@ class LivingTemplatesDaemon:
             "node_type": node.config.node_type.value,
             "outputs": node.config.outputs,
             "created_at": node.created_at.isoformat() if node.created_at else None,
-            "config": node.config.dict()
+            "config": node.config.model_dump(mode="json")
         })
     
     async def _api_get_node_inputs(self, request: web.Request) -> web.Response:
@@ -1132,6 +1582,19 @@ class LivingTemplatesDaemon:
             return web.json_response({"status": "success"})
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
+    
+    async def _api_trigger_webhooks(self, request: web.Request) -> web.Response:
+        """API endpoint: Trigger a batch of webhooks."""
+        try:
+            data = await request.json()
+            items = data["webhooks"]
+            await self.trigger_webhooks(items)
+            return web.json_response({"status": "success", "count": len(items)})
+        except (ValueError, KeyError, TypeError) as e:
+            # Malformed JSON or entries; sending the same batch again can't succeed
+            return web.json_response({"error": str(e)}, status=400)
+        except Exception as e:
+            return web.json_response({"error": str(e)}, status=500)
 
 
 # Keep legacy DaemonClient for backward compatibility
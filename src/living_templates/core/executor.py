@@ -1,24 +1,94 @@
 """Program executor for Living Templates."""
 
 import asyncio
-import json
+import atexit
+import collections
+import itertools
 import os
+import re
 import shlex
+import shutil
 import subprocess
 import tempfile
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from .models import ExecutionLog, LogLevel, NodeConfig, NodeInstance, TemplateNode
+from .serialization import dumps
+
+# ${name} placeholders in program commands
+_PLACEHOLDER_RE = re.compile(r"\$\{([^}]+)\}")
+
+# Severity order used to filter execution logs
+_LEVEL_ORDER = {LogLevel.DEBUG: 0, LogLevel.INFO: 1, LogLevel.WARNING: 2, LogLevel.ERROR: 3}
+
+# Most recent lines of program stdout/stderr kept for the execution log
+MAX_OUTPUT_LINES = 1000
+
+
+async def _drain_lines(stream: asyncio.StreamReader, lines: Deque[bytes]) -> None:
+    """Read a stream line by line into a bounded buffer until EOF."""
+    while True:
+        try:
+            line = await stream.readline()
+        except ValueError:
+            # Line exceeded the stream limit and was discarded
+            continue
+        if not line:
+            break
+        lines.append(line)
+
+
+def _decode_lines(lines: Deque[bytes]) -> str:
+    """Decode buffered output lines in a single pass."""
+    return b"".join(lines).decode('utf-8', errors='replace')
 
 
 class ProgramExecutor:
     """Executes program nodes."""
     
-    def __init__(self):
-        """Initialize program executor."""
+    def __init__(self, min_level: LogLevel = LogLevel.DEBUG):
+        """Initialize program executor.
+        
+        Args:
+            min_level: Least severe execution log level to record. Defaults to
+                DEBUG, which records every entry including the executed command
+        """
+        self.min_level = min_level
         self.active_processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._tmp_root: Optional[Path] = None  # parent of per-execution output directories
+        # node_id -> ((config environment, passthrough), os.environ size, merged base environment)
+        self._base_env_cache: Dict[str, Tuple[Tuple[Any, ...], int, Dict[str, str]]] = {}
+        # node_id -> (configured working directory, resolved path)
+        self._workdir_cache: Dict[str, Tuple[str, Path]] = {}
+    
+    def invalidate(self, node_id: str) -> None:
+        """Drop cached per-node execution state.
+        
+        Args:
+            node_id: ID of the node whose config changed or was removed
+        """
+        self._base_env_cache.pop(node_id, None)
+        self._workdir_cache.pop(node_id, None)
+    
+    def _base_env(self, node: TemplateNode) -> Dict[str, str]:
+        """Get a fresh copy of the process environment merged with the node's environment.
+        
+        If the node sets env_passthrough, only those process variables are inherited.
+        """
+        cfg_env = node.config.environment
+        passthrough = node.config.env_passthrough
+        key = (cfg_env, passthrough)
+        cached = self._base_env_cache.get(node.id)
+        if cached is None or cached[0] != key or cached[1] != len(os.environ):
+            if passthrough is None:
+                inherited = dict(os.environ)
+            else:
+                inherited = {name: os.environ[name] for name in passthrough if name in os.environ}
+            cached = (key, len(os.environ), {**inherited, **cfg_env})
+            self._base_env_cache[node.id] = cached
+        return dict(cached[2])
     
     async def execute_program(
         self, 
@@ -38,36 +108,49 @@ class ProgramExecutor:
         """
         logs = []
         execution_id = str(uuid.uuid4())
+        node_id = node.id
+        instance_id = instance.id
+        # Log IDs only need to be unique, so derive them from the one random execution ID
+        log_seq = itertools.count()
+        min_rank = _LEVEL_ORDER[self.min_level]
+        debug = min_rank == 0
+        
+        def log(level: LogLevel, message: str, details: Optional[Dict[str, Any]] = None) -> None:
+            if _LEVEL_ORDER[level] < min_rank:
+                return
+            # Entries are built from trusted values here, so skip model validation
+            logs.append(ExecutionLog.model_construct(
+                id=f"{execution_id}-{next(log_seq)}",
+                node_id=node_id,
+                instance_id=instance_id,
+                level=level,
+                message=message,
+                details=details
+            ))
         
-        logs.append(ExecutionLog(
-            id=str(uuid.uuid4()),
-            node_id=node.id,
-            instance_id=instance.id,
-            level=LogLevel.INFO,
-            message=f"Starting program execution: {execution_id}",
-            details={"input_values": input_values}
-        ))
+        log(LogLevel.INFO, f"Starting program execution: {execution_id}", {"input_values": input_values})
         
         try:
+            # Encode each input once for the environment, arguments and placeholders
+            encoded = {
+                key: dumps(value) if isinstance(value, (dict, list)) else str(value)
+                for key, value in input_values.items()
+            }
+            
             # Prepare execution environment
-            env = os.environ.copy()
-            env.update(node.config.environment)
+            env = self._base_env(node)
             
             # Add input values to environment with LT_ prefix
-            for key, value in input_values.items():
-                env_key = f"LT_{key.upper()}"
-                if isinstance(value, (dict, list)):
-                    env[env_key] = json.dumps(value)
-                else:
-                    env[env_key] = str(value)
+            env_keys = node.config.lt_env_keys
+            for key, value in encoded.items():
+                env[env_keys.get(key) or f"LT_{key.upper()}"] = value
             
             # Determine working directory
-            work_dir = Path(node.config.working_directory) if node.config.working_directory else Path.cwd()
-            work_dir = work_dir.resolve()
+            work_dir = self._working_directory(node)
             
             # Create temporary output directory
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+            temp_path = self._make_run_dir(execution_id)
+            try:
                 env["LT_OUTPUT_DIR"] = str(temp_path)
                 
                 # Execute the program
@@ -77,52 +160,32 @@ class ProgramExecutor:
                     if not script_path.is_absolute():
                         script_path = work_dir / script_path
                     
-                    # Make script executable
-                    script_path.chmod(script_path.stat().st_mode | 0o755)
+                    # Make script executable if it isn't already
+                    mode = script_path.stat().st_mode
+                    if mode & 0o755 != 0o755:
+                        script_path.chmod(mode | 0o755)
                     
                     # Build command args with input values
-                    cmd_args = [str(script_path)]
-                    for key, value in input_values.items():
-                        if isinstance(value, (dict, list)):
-                            cmd_args.append(json.dumps(value))
-                        else:
-                            cmd_args.append(str(value))
+                    cmd_args = [str(script_path), *encoded.values()]
                     
-                    logs.append(ExecutionLog(
-                        id=str(uuid.uuid4()),
-                        node_id=node.id,
-                        instance_id=instance.id,
-                        level=LogLevel.DEBUG,
-                        message=f"Executing script: {script_path}",
-                        details={"args": cmd_args, "cwd": str(work_dir)}
-                    ))
+                    if debug:
+                        log(LogLevel.DEBUG, f"Executing script: {script_path}", {"args": cmd_args, "cwd": str(work_dir)})
                     
                 elif node.config.command:
-                    # Execute command string
-                    # Replace placeholders in command
-                    command = node.config.command
-                    for key, value in input_values.items():
-                        placeholder = f"${{{key}}}"
-                        if isinstance(value, (dict, list)):
-                            replacement = json.dumps(value)
-                        else:
-                            replacement = str(value)
-                        command = command.replace(placeholder, replacement)
+                    # Execute command string, split once per config; each substituted
+                    # placeholder stays within the argument it appears in
+                    def substitute(match: re.Match) -> str:
+                        return encoded.get(match.group(1), match.group(0))
                     
-                    cmd_args = shlex.split(command)
+                    cmd_args = [_PLACEHOLDER_RE.sub(substitute, token) for token in node.config.command_tokens]
                     
-                    logs.append(ExecutionLog(
-                        id=str(uuid.uuid4()),
-                        node_id=node.id,
-                        instance_id=instance.id,
-                        level=LogLevel.DEBUG,
-                        message=f"Executing command: {command}",
-                        details={"args": cmd_args, "cwd": str(work_dir)}
-                    ))
+                    if debug:
+                        log(LogLevel.DEBUG, f"Executing command: {shlex.join(cmd_args)}", {"args": cmd_args, "cwd": str(work_dir)})
                 else:
                     raise ValueError("Program node must have script_path or command")
                 
-                # Run the process
+                # Run the process. Don't add preexec_fn or pass_fds here: without them
+                # CPython (3.10+) spawns via vfork instead of copying the daemon's memory.
                 process = await asyncio.create_subprocess_exec(
                     *cmd_args,
                     cwd=work_dir,
@@ -134,97 +197,99 @@ class ProgramExecutor:
                 self.active_processes[execution_id] = process
                 
                 try:
-                    # Wait for completion with timeout
-                    stdout, stderr = await asyncio.wait_for(
-                        process.communicate(),
-                        timeout=node.config.timeout
+                    # Stream output into bounded buffers while waiting, with timeout
+                    stdout: Deque[bytes] = collections.deque(maxlen=MAX_OUTPUT_LINES)
+                    stderr: Deque[bytes] = collections.deque(maxlen=MAX_OUTPUT_LINES)
+                    run = asyncio.gather(
+                        _drain_lines(process.stdout, stdout),
+                        _drain_lines(process.stderr, stderr),
+                        process.wait()
                     )
+                    try:
+                        done, _ = await asyncio.wait({run}, timeout=node.config.timeout)
+                    except asyncio.CancelledError:
+                        # Don't leave the program running; the drains finish once its pipes close
+                        process.kill()
+                        raise
+                    if not done:
+                        process.kill()
+                        await asyncio.wait({run})
+                        raise RuntimeError(f"Program execution timed out after {node.config.timeout} seconds")
+                    run.result()
                     
                     return_code = process.returncode
                     
                     # Log output
                     if stdout:
-                        logs.append(ExecutionLog(
-                            id=str(uuid.uuid4()),
-                            node_id=node.id,
-                            instance_id=instance.id,
-                            level=LogLevel.INFO,
-                            message="Program stdout",
-                            details={"output": stdout.decode('utf-8', errors='replace')}
-                        ))
+                        log(LogLevel.INFO, "Program stdout", {"output": _decode_lines(stdout)})
                     
                     if stderr:
                         level = LogLevel.ERROR if return_code != 0 else LogLevel.WARNING
-                        logs.append(ExecutionLog(
-                            id=str(uuid.uuid4()),
-                            node_id=node.id,
-                            instance_id=instance.id,
-                            level=level,
-                            message="Program stderr",
-                            details={"output": stderr.decode('utf-8', errors='replace')}
-                        ))
+                        log(level, "Program stderr", {"output": _decode_lines(stderr)})
                     
                     if return_code != 0:
                         raise subprocess.CalledProcessError(return_code, cmd_args[0])
                     
                     # Collect output files
                     output_files = []
+                    # One directory read instead of a stat per expected output
+                    produced = {entry.name for entry in os.scandir(temp_path)}
                     for output_name in node.config.outputs:
                         output_file = temp_path / output_name
-                        if output_file.exists():
+                        # Nested output names aren't in the listing; check those directly
+                        if output_name in produced or (os.sep in output_name and output_file.exists()):
                             # Copy to a persistent temporary file that won't be cleaned up
                             persistent_temp = tempfile.NamedTemporaryFile(delete=False, suffix=f"_{output_name}")
                             persistent_temp.write(output_file.read_bytes())
                             persistent_temp.close()
                             output_files.append(persistent_temp.name)
                         else:
-                            logs.append(ExecutionLog(
-                                id=str(uuid.uuid4()),
-                                node_id=node.id,
-                                instance_id=instance.id,
-                                level=LogLevel.WARNING,
-                                message=f"Expected output file not found: {output_name}",
-                                details={"expected_path": str(output_file)}
-                            ))
+                            log(LogLevel.WARNING, f"Expected output file not found: {output_name}", {"expected_path": str(output_file)})
                     
-                    logs.append(ExecutionLog(
-                        id=str(uuid.uuid4()),
-                        node_id=node.id,
-                        instance_id=instance.id,
-                        level=LogLevel.INFO,
-                        message=f"Program execution completed successfully",
-                        details={
-                            "return_code": return_code,
-                            "output_files": output_files,
-                            "execution_id": execution_id
-                        }
-                    ))
+                    log(LogLevel.INFO, f"Program execution completed successfully", {
+                        "return_code": return_code,
+                        "output_files": output_files,
+                        "execution_id": execution_id
+                    })
                     
                     return output_files, logs
                     
-                except asyncio.TimeoutError:
-                    process.kill()
-                    await process.wait()
-                    raise RuntimeError(f"Program execution timed out after {node.config.timeout} seconds")
-                
                 finally:
-                    if execution_id in self.active_processes:
-                        del self.active_processes[execution_id]
+                    self.active_processes.pop(execution_id, None)
+            
+            finally:
+                # Remove the run directory off the event loop
+                asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, temp_path, True)
         
         except Exception as e:
-            logs.append(ExecutionLog(
-                id=str(uuid.uuid4()),
-                node_id=node.id,
-                instance_id=instance.id,
-                level=LogLevel.ERROR,
-                message=f"Program execution failed: {str(e)}",
-                details={
-                    "error_type": type(e).__name__,
-                    "execution_id": execution_id
-                }
-            ))
+            log(LogLevel.ERROR, f"Program execution failed: {str(e)}", {
+                "error_type": type(e).__name__,
+                "execution_id": execution_id
+            })
             raise
     
+    def _working_directory(self, node: TemplateNode) -> Path:
+        """Get the resolved working directory for a node's program."""
+        configured = node.config.working_directory
+        if not configured:
+            # getcwd already returns a resolved path
+            return Path.cwd()
+        
+        cached = self._workdir_cache.get(node.id)
+        if cached is None or cached[0] != configured:
+            cached = (configured, Path(configured).resolve())
+            self._workdir_cache[node.id] = cached
+        return cached[1]
+    
+    def _make_run_dir(self, execution_id: str) -> Path:
+        """Create an output directory for one execution under a shared temp root."""
+        if self._tmp_root is None:
+            self._tmp_root = Path(tempfile.mkdtemp(prefix="lt-exec-"))
+            atexit.register(shutil.rmtree, self._tmp_root, True)
+        run_dir = self._tmp_root / execution_id
+        run_dir.mkdir()
+        return run_dir
+    
     async def kill_process(self, execution_id: str) -> bool:
         """Kill a running process.
         
@@ -234,13 +299,12 @@ class ProgramExecutor:
         Returns:
             True if process was killed, False if not found
         """
-        if execution_id in self.active_processes:
-            process = self.active_processes[execution_id]
-            process.kill()
-            await process.wait()
-            del self.active_processes[execution_id]
-            return True
-        return False
+        process = self.active_processes.pop(execution_id, None)
+        if process is None:
+            return False
+        process.kill()
+        await process.wait()
+        return True
     
     def get_active_processes(self) -> List[str]:
         """Get list of active execution IDs."""
@@ -1,11 +1,14 @@
 """Core data models for Living Templates."""
 
+import hashlib
+import shlex
+from collections import deque
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Union
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationInfo, field_validator
 
 
 class NodeType(str, Enum):
@@ -56,13 +59,14 @@ class InputSpec(BaseModel):
     type: InputType
     description: Optional[str] = None
     default: Optional[Any] = None
-    required: bool = True
+    required: bool = Field(default=True, validate_default=True)
     source: Optional[str] = None  # Reference to another node: "@node-id.output"
 
-    @validator('required', pre=True, always=True)
-    def set_required_if_no_default(cls, v: bool, values: Dict[str, Any]) -> bool:
+    @field_validator('required', mode='before')
+    @classmethod
+    def set_required_if_no_default(cls, v: bool, info: ValidationInfo) -> bool:
         """Set required=False if default is provided."""
-        if 'default' in values and values['default'] is not None:
+        if info.data.get('default') is not None:
             return False
         return v
 
@@ -87,6 +91,7 @@ class NodeConfig(BaseModel):
     command: Optional[str] = None
     working_directory: Optional[str] = None
     environment: Dict[str, str] = Field(default_factory=dict)
+    env_passthrough: Optional[List[str]] = None  # Inherited variables; None inherits all
     timeout: Optional[int] = 300  # 5 minutes default
     
     # Webhook-specific
@@ -95,6 +100,41 @@ class NodeConfig(BaseModel):
     # Tail-specific
     tail_lines: int = 10  # Number of lines to keep in memory for tail
     tail_separator: str = "\n"
+    
+    _file_input_names: Optional[FrozenSet[str]] = PrivateAttr(default=None)
+    _config_hash: Optional[str] = PrivateAttr(default=None)
+    _command_tokens: Optional[List[str]] = PrivateAttr(default=None)
+    _lt_env_keys: Optional[Dict[str, str]] = PrivateAttr(default=None)
+    
+    @property
+    def file_input_names(self) -> FrozenSet[str]:
+        """Names of inputs with type file, computed once per config."""
+        if self._file_input_names is None:
+            self._file_input_names = frozenset(
+                name for name, spec in self.inputs.items() if spec.type == InputType.FILE
+            )
+        return self._file_input_names
+    
+    @property
+    def command_tokens(self) -> List[str]:
+        """Shell-split command with placeholders unexpanded, computed once per config."""
+        if self._command_tokens is None:
+            self._command_tokens = shlex.split(self.command or "")
+        return self._command_tokens
+    
+    @property
+    def lt_env_keys(self) -> Dict[str, str]:
+        """Environment variable name (LT_<NAME>) for each input, computed once per config."""
+        if self._lt_env_keys is None:
+            self._lt_env_keys = {name: f"LT_{name.upper()}" for name in self.inputs}
+        return self._lt_env_keys
+    
+    @property
+    def config_hash(self) -> str:
+        """Digest of the serialized config, computed once per config."""
+        if self._config_hash is None:
+            self._config_hash = hashlib.blake2b(self.model_dump_json().encode(), digest_size=16).hexdigest()
+        return self._config_hash
 
 
 class NodeInstance(BaseModel):
@@ -106,10 +146,19 @@ class NodeInstance(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     last_built: Optional[datetime] = None
     build_count: int = 0
+    
+    _resolved_file_inputs: Dict[str, str] = PrivateAttr(default_factory=dict)
+    
+    @property
+    def resolved_file_inputs(self) -> Dict[str, str]:
+        """Cache of file input values to their resolved paths."""
+        return self._resolved_file_inputs
 
 
 class NodeValue(BaseModel):
     """A stored value for a node output."""
+    model_config = ConfigDict(frozen=True)
+    
     node_id: str
     output_name: str
     value_hash: str
@@ -148,7 +197,8 @@ class TemplateNode(BaseModel):
     config_path: Optional[Path] = None
     created_at: datetime = Field(default_factory=datetime.now)
     
-    @validator('config')
+    @field_validator('config')
+    @classmethod
     def validate_node_config(cls, v: NodeConfig) -> NodeConfig:
         """Validate node-specific configuration."""
         if v.node_type == NodeType.TEMPLATE and not v.template_content:
@@ -169,6 +219,8 @@ class DependencyEdge(BaseModel):
 
 class ExecutionLog(BaseModel):
     """Log entry for node execution."""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     node_id: str
     instance_id: Optional[str] = None
@@ -193,13 +245,17 @@ class TailState(BaseModel):
     file_path: str
     last_position: int = 0
     last_inode: Optional[int] = None
-    buffer: List[str] = Field(default_factory=list)
+    buffer: Deque[str] = Field(default_factory=deque)
     updated_at: datetime = Field(default_factory=datetime.now)
+    # Bytes after the last newline read so far, completed by the next read
+    _partial: bytes = PrivateAttr(default=b"")
 
 
 class WebhookTrigger(BaseModel):
     """Webhook trigger data."""
     node_id: str
+    # Assigned when the trigger is stored
+    id: Optional[str] = None
     data: Dict[str, Any]
     headers: Dict[str, str] = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.now) 
\ No newline at end of file
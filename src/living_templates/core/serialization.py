@@ -0,0 +1,53 @@
+"""JSON serialization helpers for Living Templates."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to a compact JSON string.
+    
+    Uses orjson when it is installed and falls back to the standard library
+    for values orjson can't encode (e.g. non-string keys, very large ints).
+    Both paths produce the same compact separators.
+    
+    Args:
+        value: JSON-serializable value
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document.
+    
+    Uses orjson when it is installed and falls back to the standard library
+    for documents only it accepts (e.g. NaN written by the ``dumps`` fallback).
+    
+    Args:
+        data: JSON string or bytes
+        
+    Returns:
+        Parsed value
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
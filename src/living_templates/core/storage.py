@@ -1,13 +1,20 @@
 """Storage layer for Living Templates."""
 
 import hashlib
-import json
+import mmap
 import os
+import shutil
 import sqlite3
+import threading
+import time
 import asyncio
+import concurrent.futures
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import aiosqlite
 
@@ -15,6 +22,74 @@ from .models import (
     DependencyEdge, ExecutionLog, NodeConfig, NodeInstance, NodeValue, 
     OutputMode, TemplateNode, TailState, WebhookTrigger
 )
+from .serialization import dumps, loads
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - optional dependency
+    _blake3 = None
+
+# Content hashes only address files, so let OpenSSL (which picks SHA-NI/AVX
+# code paths itself) skip FIPS security checks where that flag exists (3.9+).
+try:
+    hashlib.sha256(usedforsecurity=False)
+except TypeError:  # pragma: no cover - Python 3.8
+    _sha256 = hashlib.sha256
+else:
+    def _sha256(data: bytes = b"") -> "hashlib._Hash":
+        return hashlib.sha256(data, usedforsecurity=False)
+
+# BLAKE3 hashes carry a prefix so they never collide with SHA-256 ones,
+# which stay valid in stores created without blake3 installed.
+BLAKE3_PREFIX = "b3_"
+
+# Version of the schema Database.initialize creates, kept in PRAGMA
+# user_version. Bump it when a table or stored format changes; databases
+# with any other version are rebuilt from scratch.
+SCHEMA_VERSION = 1
+
+
+def _new_hasher(data: bytes = b"") -> Any:
+    """Create a hasher for new content, preferring BLAKE3 when installed."""
+    if _blake3 is not None:
+        return _blake3(data)
+    return _sha256(data)
+
+
+def _hash_file(path: Path, factory: Callable[[], Any] = _new_hasher) -> Any:
+    """Hash a file's bytes without loading it whole.
+    
+    Uses hashlib.file_digest (Python 3.11+), which reads into one reused
+    buffer in C, and a chunked read loop before that.
+    
+    Returns:
+        The (unfinalized) hasher
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, factory)
+        hasher = factory()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+        return hasher
+
+
+def _digest(hasher: Any) -> str:
+    """Get the content hash a hasher from ``_new_hasher`` addresses."""
+    if _blake3 is not None and isinstance(hasher, _blake3):
+        return BLAKE3_PREFIX + hasher.hexdigest()
+    return hasher.hexdigest()
+
+
+def _to_ns(dt: datetime) -> int:
+    """Convert a datetime to the integer epoch nanoseconds stored in the database."""
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+
+
+def _from_ns(ns: int) -> datetime:
+    """Convert stored epoch nanoseconds back to a naive local datetime."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
 
 
 class DatabaseRetry:
@@ -34,6 +109,44 @@ class DatabaseRetry:
                 raise
 
 
+class _ContentCache:
+    """Size-capped LRU cache of stored content, keyed by content hash."""
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize content cache.
+        
+        Args:
+            max_bytes: Approximate total size of cached content
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+    
+    def get(self, content_hash: str) -> Optional[str]:
+        """Get cached content, marking it most recently used."""
+        content = self._entries.get(content_hash)
+        if content is not None:
+            self._entries.move_to_end(content_hash)
+        return content
+    
+    def put(self, content_hash: str, content: str) -> None:
+        """Cache content, evicting least recently used entries over the cap."""
+        if len(content) > self.max_bytes:
+            return
+        self.pop(content_hash)
+        self._entries[content_hash] = content
+        self.total_bytes += len(content)
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+    
+    def pop(self, content_hash: str) -> None:
+        """Drop content from the cache if present."""
+        content = self._entries.pop(content_hash, None)
+        if content is not None:
+            self.total_bytes -= len(content)
+
+
 class ContentStore:
     """Content-addressed storage for generated files."""
     
@@ -45,33 +158,124 @@ class ContentStore:
         """
         self.store_path = store_path
         self.store_path.mkdir(parents=True, exist_ok=True)
+        # Entries live directly under the store, so resolve it only once
+        self.store_abs = self.store_path.resolve()
+        # Unfinalized hashers of append chain heads, keyed by content hash
+        self._hash_state: Dict[str, "hashlib._Hash"] = {}
+        # Stored content is immutable per hash, so reads never go stale
+        self._content_cache = _ContentCache()
+        # Hashes known to be stored, indexed from the directory on first use
+        self._known: Optional[Set[str]] = None
     
-    def _hash_content(self, content: str) -> str:
-        """Generate hash for content."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def hash_content(self, content: Union[str, bytes]) -> str:
+        """Get the hash content is stored under, without storing it.
+        
+        Args:
+            content: Content to hash; text is hashed UTF-8 encoded
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        return _digest(_new_hasher(data))
     
-    def store_content(self, content: str, output_mode: OutputMode = OutputMode.REPLACE) -> Tuple[str, Path]:
+    def absolute_path_for(self, content_hash: str) -> Path:
+        """Get the absolute, symlink-free path of a stored entry."""
+        return self.store_abs / content_hash
+    
+    def exists(self, content_hash: str) -> bool:
+        """Check whether content with the given hash is already stored.
+        
+        Known hashes are answered from memory; the filesystem is only checked
+        on a miss, so entries added by another process are still found.
+        """
+        if self._known is None:
+            with os.scandir(self.store_path) as entries:
+                self._known = {
+                    entry.name for entry in entries
+                    if '.' not in entry.name and entry.is_file(follow_symlinks=False)
+                }
+        if content_hash in self._known:
+            return True
+        if os.path.lexists(self.absolute_path_for(content_hash)):
+            self._known.add(content_hash)
+            return True
+        return False
+    
+    def store_content(
+        self,
+        content: Union[str, bytes],
+        output_mode: OutputMode = OutputMode.REPLACE
+    ) -> Tuple[str, Path]:
         """Store content and return hash and path.
         
         Args:
-            content: Content to store
+            content: Content to store; text is stored UTF-8 encoded
             output_mode: How to handle the content
             
         Returns:
             Tuple of (content_hash, content_path)
         """
-        content_hash = self._hash_content(content)
-        content_path = self.store_path / content_hash
+        # Encode once for both hashing and writing
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        content_hash = self.hash_content(data)
+        content_path = self.absolute_path_for(content_hash)
         
         # Only write if file doesn't exist (content-addressed)
-        if not content_path.exists():
-            content_path.write_text(content, encoding='utf-8')
+        if not self.exists(content_hash):
+            self._write_atomic(content_path, data)
         
         return content_hash, content_path
     
+    def store_content_prehashed(self, content: Union[str, bytes], content_hash: str) -> Tuple[str, Path]:
+        """Store content whose hash the caller already has from this store.
+        
+        Content that is already stored is neither encoded nor hashed again.
+        
+        Args:
+            content: Content to store
+            content_hash: Hash this store gave the same content before
+            
+        Returns:
+            Tuple of (content_hash, content_path)
+        """
+        content_path = self.absolute_path_for(content_hash)
+        if not self.exists(content_hash):
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            self._write_atomic(content_path, data)
+        return content_hash, content_path
+    
+    def _write_atomic(self, content_path: Path, *chunks: bytes) -> None:
+        """Write byte chunks to a temp file and rename it into place.
+        
+        Readers never see a partially written entry. A concurrent writer of
+        the same hash is harmless since both write identical bytes.
+        """
+        tmp_path = self._tmp_path_for(content_path)
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            # Leftover from a crashed write of this process and thread id
+            os.unlink(tmp_path)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, content_path)
+        self._known.add(content_path.name)
+    
+    def _tmp_path_for(self, content_path: Path) -> str:
+        """Get the temp file path a new entry is built at before renaming."""
+        # Unique per writer thread, as the daemon stores from a thread pool
+        return f"{content_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    
     def append_content(self, existing_hash: Optional[str], new_content: str) -> Tuple[str, Path]:
         """Append content to existing content.
         
+        The hasher of the previous append is resumed, so only the new content
+        is hashed, and the existing bytes are copied without being decoded.
+        
         Args:
             existing_hash: Hash of existing content (if any)
             new_content: New content to append
@@ -79,17 +283,37 @@ class ContentStore:
         Returns:
             Tuple of (new_content_hash, content_path)
         """
-        if existing_hash:
-            existing_content = self.get_content(existing_hash) or ""
-            combined_content = existing_content + new_content
-        else:
-            combined_content = new_content
+        existing_path = self.absolute_path_for(existing_hash) if existing_hash else None
+        if existing_path is None or not existing_path.exists():
+            return self.store_content(new_content)
+        
+        hasher = self._hash_state.pop(existing_hash, None)
+        if hasher is None:
+            hasher = _hash_file(existing_path)
         
-        return self.store_content(combined_content)
+        data = new_content.encode('utf-8')
+        hasher.update(data)
+        content_hash = _digest(hasher)
+        content_path = self.absolute_path_for(content_hash)
+        self._hash_state[content_hash] = hasher
+        
+        if not self.exists(content_hash):
+            # Stored files are shared by hash, so build the new one beside them
+            tmp_path = self._tmp_path_for(content_path)
+            shutil.copyfile(existing_path, tmp_path)
+            with open(tmp_path, 'ab') as f:
+                f.write(data)
+            os.replace(tmp_path, content_path)
+            self._known.add(content_hash)
+        
+        return content_hash, content_path
     
     def prepend_content(self, existing_hash: Optional[str], new_content: str) -> Tuple[str, Path]:
         """Prepend content to existing content.
         
+        Prepending changes the start of the hashed stream, so unlike appends
+        the combined content has to be hashed in full.
+        
         Args:
             existing_hash: Hash of existing content (if any)
             new_content: New content to prepend
@@ -97,36 +321,113 @@ class ContentStore:
         Returns:
             Tuple of (new_content_hash, content_path)
         """
-        if existing_hash:
-            existing_content = self.get_content(existing_hash) or ""
-            combined_content = new_content + existing_content
-        else:
-            combined_content = new_content
+        existing = self.get_content_bytes(existing_hash) if existing_hash else None
+        if existing is None:
+            return self.store_content(new_content)
+        
+        try:
+            data = new_content.encode('utf-8')
+            hasher = _new_hasher(data)
+            hasher.update(existing)
+            content_hash = _digest(hasher)
+            content_path = self.absolute_path_for(content_hash)
+            
+            if not self.exists(content_hash):
+                self._write_atomic(content_path, data, existing)
+        finally:
+            existing.release()
         
-        return self.store_content(combined_content)
+        return content_hash, content_path
+    
+    def get_content_bytes(self, content_hash: str) -> Optional[memoryview]:
+        """Retrieve stored content as a read-only view, without decoding it.
+        
+        The file is memory-mapped, so nothing is copied until the view is read.
+        Call ``release()`` on the view when done with it.
+        
+        Returns:
+            View of the content, or None if no content has that hash
+        """
+        try:
+            with open(self.absolute_path_for(content_hash), 'rb') as f:
+                try:
+                    return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                except ValueError:
+                    # Empty files can't be mapped
+                    return memoryview(b"")
+        except FileNotFoundError:
+            return None
     
     def get_content(self, content_hash: str) -> Optional[str]:
         """Retrieve content by hash."""
-        content_path = self.store_path / content_hash
+        content = self._content_cache.get(content_hash)
+        if content is not None:
+            return content
+        
+        content_path = self.absolute_path_for(content_hash)
         if content_path.exists():
-            return content_path.read_text(encoding='utf-8')
+            content = content_path.read_text(encoding='utf-8')
+            self._content_cache.put(content_hash, content)
+            return content
         return None
     
-    def cleanup_unused(self, used_hashes: List[str]) -> int:
+    def cleanup_unused(self, used_hashes: Iterable[str]) -> int:
         """Remove unused content files.
         
         Args:
-            used_hashes: List of hashes that are still in use
+            used_hashes: Hashes that are still in use
             
         Returns:
             Number of files removed
         """
+        used = frozenset(used_hashes)
         removed = 0
-        for content_file in self.store_path.iterdir():
-            if content_file.is_file() and content_file.name not in used_hashes:
-                content_file.unlink()
-                removed += 1
+        with os.scandir(self.store_path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and entry.name not in used:
+                    os.unlink(entry.path)
+                    self._content_cache.pop(entry.name)
+                    self._hash_state.pop(entry.name, None)
+                    if self._known is not None:
+                        self._known.discard(entry.name)
+                    removed += 1
         return removed
+    
+    def verify(self, hashes: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+        """Check stored files against the hashes they are stored under.
+        
+        Files are hashed concurrently; hashlib and blake3 release the GIL while
+        hashing large buffers, so this scales across cores. BLAKE3 entries
+        can only be checked when blake3 is installed and are skipped otherwise.
+        
+        Args:
+            hashes: Content hashes to verify
+            max_workers: Number of hashing threads. Defaults to the CPU count
+            
+        Returns:
+            Hashes whose files are missing or don't match their content
+        """
+        def _matches(content_hash: str) -> bool:
+            if content_hash.startswith(BLAKE3_PREFIX):
+                if _blake3 is None:
+                    # Can't check without blake3; don't report it as corrupt
+                    return True
+                factory = _blake3
+            else:
+                factory = _sha256
+            try:
+                hasher = _hash_file(self.absolute_path_for(content_hash), factory)
+            except OSError:
+                return False
+            return _digest(hasher) == content_hash
+        
+        hashes = list(hashes)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            thread_name_prefix="lt-verify"
+        ) as pool:
+            results = pool.map(_matches, hashes)
+            return [h for h, ok in zip(hashes, results) if not ok]
 
 
 class SymlinkManager:
@@ -137,17 +438,32 @@ class SymlinkManager:
         
         Args:
             target_path: Where the symlink should be created
-            content_path: What the symlink should point to
+            content_path: Absolute, resolved path the symlink should point to
+                (see ContentStore.absolute_path_for)
         """
         # Remove existing file/symlink
-        if target_path.exists() or target_path.is_symlink():
-            target_path.unlink()
+        try:
+            os.unlink(target_path)
+        except FileNotFoundError:
+            pass
         
         # Create parent directories
         target_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create symlink
-        target_path.symlink_to(content_path.resolve())
+        target_path.symlink_to(content_path)
+    
+    def points_to(self, target_path: Path, content_path: Path) -> bool:
+        """Check whether target is a symlink to the given content.
+        
+        Args:
+            target_path: Path of the symlink
+            content_path: Expected absolute, resolved symlink destination
+        """
+        try:
+            return os.readlink(target_path) == str(content_path)
+        except OSError:
+            return False
     
     def append_to_file(self, target_path: Path, new_content: str) -> None:
         """Append content to a file.
@@ -169,12 +485,17 @@ class SymlinkManager:
         """
         target_path.parent.mkdir(parents=True, exist_ok=True)
         
-        existing_content = ""
-        if target_path.exists():
-            existing_content = target_path.read_text(encoding='utf-8')
-        
-        with open(target_path, 'w', encoding='utf-8') as f:
-            f.write(new_content + existing_content)
+        # Stream the old content after the new one instead of loading it
+        tmp_path = target_path.with_name(target_path.name + '.tmp')
+        with open(tmp_path, 'wb') as out:
+            out.write(new_content.encode('utf-8'))
+            try:
+                with open(target_path, 'rb') as src:
+                    shutil.copyfileobj(src, out, 1 << 20)
+                shutil.copymode(target_path, tmp_path)
+            except FileNotFoundError:
+                pass
+        os.replace(tmp_path, target_path)
     
     def remove_symlink(self, target_path: Path) -> None:
         """Remove symlink if it exists."""
@@ -192,18 +513,141 @@ class Database:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        # Shared connection, opened on first use; the lock serializes units of work on it
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # Marker of the transaction the current task joined, if any. Tasks
+        # spawned inside a transaction copy it, so it only counts while it is
+        # still the active one and long-lived tasks don't outlive it.
+        self._transaction: ContextVar[Optional[object]] = ContextVar(
+            f"living_templates_tx_{id(self)}", default=None
+        )
+        self._active_transaction: Optional[object] = None
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Run all database calls made inside the block in one transaction.
+        
+        The transaction is bound to the current task (and tasks it spawns).
+        It is committed when the block exits and rolled back on error.
+        Nested calls join the outer transaction.
+        """
+        if self._in_transaction():
+            yield
+            return
+        
+        db = await self._get_db()
+        async with self._lock:
+            await db.execute("BEGIN IMMEDIATE")
+            marker = self._active_transaction = object()
+            token = self._transaction.set(marker)
+            try:
+                yield
+            except BaseException:
+                await db.rollback()
+                raise
+            else:
+                await db.commit()
+            finally:
+                self._active_transaction = None
+                self._transaction.reset(token)
+    
+    def _in_transaction(self) -> bool:
+        """Whether the current task is inside the active transaction."""
+        marker = self._transaction.get()
+        return marker is not None and marker is self._active_transaction
+    
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Get the shared connection, opening it on first use."""
+        if self._db is None:
+            # sqlite3 caches prepared statements per connection, keyed by SQL
+            # text; keep room for every distinct statement this class issues.
+            # `async for` over a cursor fetches iter_chunk_size rows per
+            # thread hop. Autocommit mode: single statements commit on their
+            # own and multi-statement writes use an explicit BEGIN.
+            db = await aiosqlite.connect(
+                self.db_path, iter_chunk_size=256, cached_statements=256,
+                isolation_level=None
+            )
+            if self._db is not None:
+                # Another task opened it while we were connecting
+                await db.close()
+            else:
+                # page_size only takes effect on a new database, before WAL is enabled
+                await db.executescript("""
+                    PRAGMA page_size=8192;
+                    PRAGMA journal_mode=WAL;
+                    PRAGMA synchronous=NORMAL;
+                    PRAGMA busy_timeout=10000;
+                    PRAGMA temp_store=MEMORY;
+                    PRAGMA cache_size=-64000;
+                    PRAGMA mmap_size=268435456;
+                """)
+                self._db = db
+                self._lock = asyncio.Lock()
+        return self._db
+    
+    async def close(self) -> None:
+        """Close the shared connection."""
+        if self._db is not None:
+            db, self._db = self._db, None
+            await db.close()
+    
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the active transaction's connection or the shared one.
+        
+        Outside a transaction the shared connection is held exclusively
+        until the block exits, so its statements aren't interleaved with
+        another task's.
+        """
+        if self._in_transaction():
+            yield self._db
+            return
+        
+        db = await self._get_db()
+        async with self._lock:
+            try:
+                yield db
+            except BaseException:
+                # Don't leave a half-done transaction open on the shared connection
+                if db.in_transaction:
+                    await db.rollback()
+                raise
+    
+    async def _executemany(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Run a write statement once per row, all in one transaction.
+        
+        A single row runs as one autocommitted statement, skipping the
+        separate BEGIN and COMMIT round trips.
+        """
+        if len(rows) == 1:
+            async with self._connection() as db:
+                await db.execute(sql, rows[0])
+            return
+        
+        async with self.transaction(), self._connection() as db:
+            await db.executemany(sql, rows)
     
     async def initialize(self) -> None:
-        """Initialize database schema."""
+        """Initialize database schema.
+        
+        A database already at ``SCHEMA_VERSION`` is kept as is, so nodes,
+        instances and watches survive a daemon restart.
+        """
         async def _init_db():
-            async with aiosqlite.connect(self.db_path) as db:
-                # Enable WAL mode for better concurrency
-                await db.execute("PRAGMA journal_mode=WAL")
-                await db.execute("PRAGMA synchronous=NORMAL")
-                await db.execute("PRAGMA busy_timeout=10000")  # 10 seconds
+            # WAL mode and busy timeout are set when the shared connection opens
+            async with self._connection() as db:
+                async with db.execute("PRAGMA user_version") as cursor:
+                    (version,) = await cursor.fetchone()
+                if version == SCHEMA_VERSION:
+                    return
                 
-                # Drop all existing tables to ensure clean schema
-                await db.executescript("""
+                # Unversioned or outdated: drop all existing tables to ensure clean schema
+                await db.executescript(f"""
+                    BEGIN;
+                    
+                    DROP TABLE IF EXISTS watches;
                     DROP TABLE IF EXISTS webhook_triggers;
                     DROP TABLE IF EXISTS tail_states;
                     DROP TABLE IF EXISTS execution_logs;
@@ -218,8 +662,8 @@ class Database:
                         node_type TEXT NOT NULL,
                         config_path TEXT,
                         config_data TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        created_at INTEGER,
+                        updated_at INTEGER
                     );
                     
                     CREATE TABLE node_instances (
@@ -227,8 +671,8 @@ class Database:
                         node_id TEXT NOT NULL,
                         input_config TEXT,
                         output_path TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_built TIMESTAMP,
+                        created_at INTEGER,
+                        last_built INTEGER,
                         build_count INTEGER DEFAULT 0,
                         FOREIGN KEY (node_id) REFERENCES nodes(id)
                     );
@@ -239,7 +683,8 @@ class Database:
                         value_hash TEXT,
                         value_data TEXT,
                         content_path TEXT,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at INTEGER,
+                        value_kind TEXT NOT NULL DEFAULT 'J',
                         PRIMARY KEY (node_id, output_name),
                         FOREIGN KEY (node_id) REFERENCES nodes(id)
                     );
@@ -248,7 +693,7 @@ class Database:
                         dependent_node_id TEXT,
                         dependency_node_id TEXT,
                         dependency_output TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        created_at INTEGER,
                         PRIMARY KEY (dependent_node_id, dependency_node_id, dependency_output),
                         FOREIGN KEY (dependent_node_id) REFERENCES nodes(id),
                         FOREIGN KEY (dependency_node_id) REFERENCES nodes(id)
@@ -258,7 +703,7 @@ class Database:
                         target_path TEXT PRIMARY KEY,
                         content_hash TEXT NOT NULL,
                         node_instance_id TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        created_at INTEGER,
                         FOREIGN KEY (node_instance_id) REFERENCES node_instances(id)
                     );
                     
@@ -269,7 +714,7 @@ class Database:
                         level TEXT NOT NULL,
                         message TEXT NOT NULL,
                         details TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        timestamp INTEGER,
                         FOREIGN KEY (node_id) REFERENCES nodes(id),
                         FOREIGN KEY (instance_id) REFERENCES node_instances(id)
                     );
@@ -280,7 +725,7 @@ class Database:
                         last_position INTEGER DEFAULT 0,
                         last_inode INTEGER,
                         buffer TEXT,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at INTEGER,
                         FOREIGN KEY (node_id) REFERENCES nodes(id)
                     );
                     
@@ -289,11 +734,18 @@ class Database:
                         node_id TEXT NOT NULL,
                         data TEXT NOT NULL,
                         headers TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        timestamp INTEGER,
                         processed BOOLEAN DEFAULT FALSE,
                         FOREIGN KEY (node_id) REFERENCES nodes(id)
                     );
                     
+                    CREATE TABLE watches (
+                        path TEXT NOT NULL,
+                        node_id TEXT NOT NULL,
+                        PRIMARY KEY (path, node_id),
+                        FOREIGN KEY (node_id) REFERENCES nodes(id)
+                    );
+                    
                     CREATE INDEX idx_dependencies_dependent ON dependencies(dependent_node_id);
                     CREATE INDEX idx_dependencies_dependency ON dependencies(dependency_node_id);
                     CREATE INDEX idx_node_values_updated ON node_values(updated_at);
@@ -301,94 +753,132 @@ class Database:
                     CREATE INDEX idx_execution_logs_timestamp ON execution_logs(timestamp);
                     CREATE INDEX idx_webhook_triggers_node ON webhook_triggers(node_id);
                     CREATE INDEX idx_webhook_triggers_processed ON webhook_triggers(processed);
+                    CREATE INDEX idx_node_instances_node ON node_instances(node_id);
+                    CREATE INDEX idx_symlinks_hash ON symlinks(content_hash);
+                    CREATE INDEX idx_symlinks_instance ON symlinks(node_instance_id);
+                    CREATE INDEX idx_node_values_hash ON node_values(value_hash);
+                    
+                    -- Removing a node removes all its related data in the same statement.
+                    -- Doesn't fire for INSERT OR REPLACE while recursive_triggers is off.
+                    CREATE TRIGGER nodes_remove_related BEFORE DELETE ON nodes
+                    BEGIN
+                        DELETE FROM symlinks WHERE node_instance_id IN (SELECT id FROM node_instances WHERE node_id = OLD.id);
+                        DELETE FROM execution_logs WHERE node_id = OLD.id;
+                        DELETE FROM tail_states WHERE node_id = OLD.id;
+                        DELETE FROM watches WHERE node_id = OLD.id;
+                        DELETE FROM webhook_triggers WHERE node_id = OLD.id;
+                        DELETE FROM dependencies WHERE dependent_node_id = OLD.id OR dependency_node_id = OLD.id;
+                        DELETE FROM node_values WHERE node_id = OLD.id;
+                        DELETE FROM node_instances WHERE node_id = OLD.id;
+                    END;
+                    
+                    PRAGMA user_version = {SCHEMA_VERSION};
+                    
+                    COMMIT;
                 """)
-                await db.commit()
         
         await DatabaseRetry.execute_with_retry(_init_db)
     
     async def store_node(self, node: TemplateNode) -> None:
         """Store a node in the database."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO nodes (id, node_type, config_path, config_data, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
+        await self.store_nodes([node])
+    
+    async def store_nodes(self, nodes: List[TemplateNode]) -> None:
+        """Store multiple nodes in a single transaction."""
+        if not nodes:
+            return
+        
+        updated_at = time.time_ns()
+        await self._executemany("""
+            INSERT OR REPLACE INTO nodes (id, node_type, config_path, config_data, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 node.id,
                 node.config.node_type.value,
                 str(node.config_path) if node.config_path else None,
-                node.config.json(),
-                datetime.now().isoformat()
-            ))
-            await db.commit()
+                node.config.model_dump_json(),
+                _to_ns(node.created_at),
+                updated_at
+            )
+            for node in nodes
+        ])
     
     async def get_node(self, node_id: str) -> Optional[TemplateNode]:
         """Retrieve a node by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
                 SELECT id, node_type, config_path, config_data, created_at
                 FROM nodes WHERE id = ?
             """, (node_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    config_data = json.loads(row[3])
-                    config = NodeConfig(**config_data)
+                    config = NodeConfig.model_validate_json(row[3])
                     return TemplateNode(
                         id=row[0],
                         config=config,
                         config_path=Path(row[2]) if row[2] else None,
-                        created_at=datetime.fromisoformat(row[4])
+                        created_at=_from_ns(row[4])
                     )
         return None
     
     async def list_nodes(self) -> List[TemplateNode]:
         """List all nodes."""
         nodes = []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
                 SELECT id, node_type, config_path, config_data, created_at
                 FROM nodes ORDER BY created_at
             """) as cursor:
                 async for row in cursor:
-                    config_data = json.loads(row[3])
-                    config = NodeConfig(**config_data)
+                    config = NodeConfig.model_validate_json(row[3])
                     nodes.append(TemplateNode(
                         id=row[0],
                         config=config,
                         config_path=Path(row[2]) if row[2] else None,
-                        created_at=datetime.fromisoformat(row[4])
+                        created_at=_from_ns(row[4])
                     ))
         return nodes
     
     async def store_node_instance(self, instance: NodeInstance) -> None:
         """Store a node instance in the database."""
-        async def _store_instance():
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("PRAGMA busy_timeout=10000")
-                await db.execute("""
-                    INSERT OR REPLACE INTO node_instances (id, node_id, input_config, output_path, created_at, last_built, build_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    instance.id,
-                    instance.node_id,
-                    json.dumps(instance.input_values),
-                    instance.output_path,
-                    instance.created_at.isoformat(),
-                    instance.last_built.isoformat() if instance.last_built else None,
-                    instance.build_count
-                ))
-                await db.commit()
+        await self.store_node_instances([instance])
+    
+    async def store_node_instances(self, instances: List[NodeInstance]) -> None:
+        """Store multiple node instances in a single transaction."""
+        if not instances:
+            return
+        
+        rows = [
+            (
+                instance.id,
+                instance.node_id,
+                dumps(instance.input_values),
+                instance.output_path,
+                _to_ns(instance.created_at),
+                _to_ns(instance.last_built) if instance.last_built else None,
+                instance.build_count
+            )
+            for instance in instances
+        ]
+        
+        async def _store_instances():
+            await self._executemany("""
+                INSERT OR REPLACE INTO node_instances (id, node_id, input_config, output_path, created_at, last_built, build_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
-        await DatabaseRetry.execute_with_retry(_store_instance)
+        await DatabaseRetry.execute_with_retry(_store_instances)
     
     async def get_node_instances(self, node_id: Optional[str] = None) -> List[NodeInstance]:
         """Get node instances."""
         instances = []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             if node_id:
-                query = "SELECT * FROM node_instances WHERE node_id = ?"
+                query = "SELECT id, node_id, input_config, output_path, created_at, last_built, build_count FROM node_instances WHERE node_id = ?"
                 params = (node_id,)
             else:
-                query = "SELECT * FROM node_instances"
+                query = "SELECT id, node_id, input_config, output_path, created_at, last_built, build_count FROM node_instances"
                 params = ()
             
             async with db.execute(query, params) as cursor:
@@ -396,74 +886,95 @@ class Database:
                     instances.append(NodeInstance(
                         id=row[0],
                         node_id=row[1],
-                        input_values=json.loads(row[2]),
+                        input_values=loads(row[2]),
                         output_path=row[3],
-                        created_at=datetime.fromisoformat(row[4]),
-                        last_built=datetime.fromisoformat(row[5]) if row[5] else None,
+                        created_at=_from_ns(row[4]),
+                        last_built=_from_ns(row[5]) if row[5] else None,
                         build_count=row[6]
                     ))
         return instances
     
     async def store_node_value(self, value: NodeValue) -> None:
         """Store a node value."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO node_values 
-                (node_id, output_name, value_hash, value_data, content_path, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+        await self.store_node_values([value])
+    
+    async def store_node_values(self, values: List[NodeValue]) -> None:
+        """Store multiple node values in a single transaction."""
+        if not values:
+            return
+        
+        await self._executemany("""
+            INSERT OR REPLACE INTO node_values 
+            (node_id, output_name, value_hash, value_data, content_path, updated_at, value_kind)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 value.node_id,
                 value.output_name,
                 value.value_hash,
-                json.dumps(value.value_data) if not isinstance(value.value_data, str) else value.value_data,
+                value.value_data if isinstance(value.value_data, str) else dumps(value.value_data),
                 value.content_path,
-                value.updated_at.isoformat()
-            ))
-            await db.commit()
+                _to_ns(value.updated_at),
+                # 'S' stores strings verbatim, 'J' stores anything else as JSON
+                'S' if isinstance(value.value_data, str) else 'J'
+            )
+            for value in values
+        ])
     
     async def get_node_value(self, node_id: str, output_name: str) -> Optional[NodeValue]:
         """Get a node value."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
-                SELECT * FROM node_values WHERE node_id = ? AND output_name = ?
+                SELECT node_id, output_name, value_hash, value_data, content_path, updated_at, value_kind
+                FROM node_values WHERE node_id = ? AND output_name = ?
             """, (node_id, output_name)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    # Try to parse as JSON, fall back to string
-                    try:
-                        value_data = json.loads(row[3])
-                    except (json.JSONDecodeError, TypeError):
-                        value_data = row[3]
-                    
-                    return NodeValue(
-                        node_id=row[0],
-                        output_name=row[1],
-                        value_hash=row[2],
-                        value_data=value_data,
-                        content_path=row[4],
-                        updated_at=datetime.fromisoformat(row[5])
-                    )
+                    return self._node_value_from_row(row)
         return None
     
+    @staticmethod
+    def _node_value_from_row(row: Tuple[Any, ...]) -> NodeValue:
+        """Build a NodeValue from a node_values row in table column order."""
+        value_data = row[3] if row[6] == 'S' else loads(row[3])
+        
+        return NodeValue(
+            node_id=row[0],
+            output_name=row[1],
+            value_hash=row[2],
+            value_data=value_data,
+            content_path=row[4],
+            updated_at=_from_ns(row[5])
+        )
+    
     async def store_dependency(self, dependency: DependencyEdge) -> None:
         """Store a dependency relationship."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO dependencies 
-                (dependent_node_id, dependency_node_id, dependency_output, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (
+        await self.store_dependencies([dependency])
+    
+    async def store_dependencies(self, dependencies: List[DependencyEdge]) -> None:
+        """Store multiple dependency relationships in a single transaction."""
+        if not dependencies:
+            return
+        
+        created_at = time.time_ns()
+        await self._executemany("""
+            INSERT OR REPLACE INTO dependencies 
+            (dependent_node_id, dependency_node_id, dependency_output, created_at)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (
                 dependency.dependent_node_id,
                 dependency.dependency_node_id,
                 dependency.dependency_output,
-                datetime.now().isoformat()
-            ))
-            await db.commit()
+                created_at
+            )
+            for dependency in dependencies
+        ])
     
     async def get_dependents(self, node_id: str, output_name: str) -> List[str]:
         """Get nodes that depend on a specific node output."""
         dependents = []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
                 SELECT dependent_node_id FROM dependencies 
                 WHERE dependency_node_id = ? AND dependency_output = ?
@@ -472,48 +983,118 @@ class Database:
                     dependents.append(row[0])
         return dependents
     
+    async def get_dependent_values(self, node_id: str, output_name: str) -> List[NodeValue]:
+        """Get the stored values of nodes that depend on a specific node output.
+        
+        Equivalent to calling get_node_value for each of get_dependents'
+        outputs, but done in a single query.
+        """
+        async with self._connection() as db:
+            async with db.execute("""
+                SELECT nv.node_id, nv.output_name, nv.value_hash, nv.value_data,
+                       nv.content_path, nv.updated_at, nv.value_kind
+                FROM dependencies d
+                JOIN node_values nv ON nv.node_id = d.dependent_node_id
+                WHERE d.dependency_node_id = ? AND d.dependency_output = ?
+            """, (node_id, output_name)) as cursor:
+                return [self._node_value_from_row(row) for row in await cursor.fetchall()]
+    
     async def store_symlink(self, target_path: str, content_hash: str, instance_id: str) -> None:
         """Store symlink metadata."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO symlinks (target_path, content_hash, node_instance_id, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (target_path, content_hash, instance_id, datetime.now().isoformat()))
-            await db.commit()
+        await self.store_symlinks([(target_path, content_hash, instance_id)])
+    
+    async def store_symlinks(self, symlinks: List[Tuple[str, str, str]]) -> None:
+        """Store (target_path, content_hash, instance_id) symlink metadata in a single transaction."""
+        if not symlinks:
+            return
+        
+        created_at = time.time_ns()
+        await self._executemany("""
+            INSERT OR REPLACE INTO symlinks (target_path, content_hash, node_instance_id, created_at)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (target_path, content_hash, instance_id, created_at)
+            for target_path, content_hash, instance_id in symlinks
+        ])
+    
+    async def get_used_content_hashes(self) -> Set[str]:
+        """Get the content hashes still referenced by symlinks or node values.
+        
+        Both columns are indexed, so this reads the indexes rather than the tables.
+        """
+        async with self._connection() as db:
+            async with db.execute("""
+                SELECT content_hash FROM symlinks
+                UNION
+                SELECT value_hash FROM node_values WHERE value_hash IS NOT NULL
+            """) as cursor:
+                return {row[0] for row in await cursor.fetchall()}
+    
+    async def store_watches(self, watches: List[Tuple[str, str]]) -> None:
+        """Store (path, node_id) file watches."""
+        if not watches:
+            return
+        await self._executemany("""
+            INSERT OR IGNORE INTO watches (path, node_id) VALUES (?, ?)
+        """, watches)
+    
+    async def remove_watches(self, watches: List[Tuple[str, str]]) -> None:
+        """Remove (path, node_id) file watches."""
+        if not watches:
+            return
+        await self._executemany("""
+            DELETE FROM watches WHERE path = ? AND node_id = ?
+        """, watches)
+    
+    async def get_watches(self) -> List[Tuple[str, str]]:
+        """Get all stored (path, node_id) file watches."""
+        async with self._connection() as db:
+            async with db.execute("SELECT path, node_id FROM watches") as cursor:
+                return [(row[0], row[1]) for row in await cursor.fetchall()]
     
     async def store_execution_log(self, log: ExecutionLog) -> None:
         """Store execution log in the database."""
-        async def _store_log():
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("PRAGMA busy_timeout=10000")
-                await db.execute("""
-                    INSERT INTO execution_logs (id, node_id, instance_id, level, message, details, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    log.id,
-                    log.node_id,
-                    log.instance_id,
-                    log.level.value,
-                    log.message,
-                    json.dumps(log.details) if log.details else None,
-                    log.timestamp.isoformat()
-                ))
-                await db.commit()
+        await self.store_execution_logs([log])
+    
+    async def store_execution_logs(self, logs: List[ExecutionLog]) -> None:
+        """Store multiple execution logs in a single transaction."""
+        if not logs:
+            return
+        
+        rows = [
+            (
+                log.id,
+                log.node_id,
+                log.instance_id,
+                log.level.value,
+                log.message,
+                dumps(log.details) if log.details else None,
+                _to_ns(log.timestamp)
+            )
+            for log in logs
+        ]
+        
+        async def _store_logs():
+            await self._executemany("""
+                INSERT INTO execution_logs (id, node_id, instance_id, level, message, details, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
-        await DatabaseRetry.execute_with_retry(_store_log)
+        await DatabaseRetry.execute_with_retry(_store_logs)
     
     async def get_execution_logs(self, node_id: str, limit: int = 100) -> List[ExecutionLog]:
         """Get execution logs for a node."""
         logs = []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
-                SELECT * FROM execution_logs 
+                SELECT id, node_id, instance_id, level, message, details, timestamp
+                FROM execution_logs 
                 WHERE node_id = ? 
                 ORDER BY timestamp DESC 
                 LIMIT ?
             """, (node_id, limit)) as cursor:
                 async for row in cursor:
-                    details = json.loads(row[5]) if row[5] else None
+                    details = loads(row[5]) if row[5] else None
                     logs.append(ExecutionLog(
                         id=row[0],
                         node_id=row[1],
@@ -521,13 +1102,13 @@ class Database:
                         level=row[3],
                         message=row[4],
                         details=details,
-                        timestamp=datetime.fromisoformat(row[6])
+                        timestamp=_from_ns(row[6])
                     ))
         return logs
     
     async def store_tail_state(self, state: TailState) -> None:
         """Store tail state."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO tail_states 
                 (node_id, file_path, last_position, last_inode, buffer, updated_at)
@@ -537,87 +1118,96 @@ class Database:
                 state.file_path,
                 state.last_position,
                 state.last_inode,
-                json.dumps(state.buffer),
-                state.updated_at.isoformat()
+                dumps(list(state.buffer)),
+                _to_ns(state.updated_at)
             ))
-            await db.commit()
     
     async def get_tail_state(self, node_id: str) -> Optional[TailState]:
         """Get tail state for a node."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
-                SELECT * FROM tail_states WHERE node_id = ?
+                SELECT node_id, file_path, last_position, last_inode, buffer, updated_at
+                FROM tail_states WHERE node_id = ?
             """, (node_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    buffer = json.loads(row[4]) if row[4] else []
+                    buffer = loads(row[4]) if row[4] else []
                     return TailState(
                         node_id=row[0],
                         file_path=row[1],
                         last_position=row[2],
                         last_inode=row[3],
                         buffer=buffer,
-                        updated_at=datetime.fromisoformat(row[5])
+                        updated_at=_from_ns(row[5])
                     )
         return None
     
     async def store_webhook_trigger(self, trigger: WebhookTrigger) -> str:
         """Store a webhook trigger."""
-        trigger_id = trigger.node_id + "_" + str(int(trigger.timestamp.timestamp() * 1000))
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO webhook_triggers (id, node_id, data, headers, timestamp, processed)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+        return (await self.store_webhook_triggers([trigger]))[0]
+    
+    async def store_webhook_triggers(self, triggers: List[WebhookTrigger]) -> List[str]:
+        """Store multiple webhook triggers in a single transaction.
+        
+        Returns:
+            IDs of the stored triggers, in input order
+        """
+        if not triggers:
+            return []
+        
+        # Offset by position so triggers stored in one batch get distinct ids
+        now_ns = time.time_ns()
+        trigger_ids = [
+            trigger.id or f"{trigger.node_id}_{now_ns + i}"
+            for i, trigger in enumerate(triggers)
+        ]
+        await self._executemany("""
+            INSERT INTO webhook_triggers (id, node_id, data, headers, timestamp, processed)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 trigger_id,
                 trigger.node_id,
-                json.dumps(trigger.data),
-                json.dumps(trigger.headers),
-                trigger.timestamp.isoformat(),
+                dumps(trigger.data),
+                dumps(trigger.headers),
+                _to_ns(trigger.timestamp),
                 False
-            ))
-            await db.commit()
-        return trigger_id
+            )
+            for trigger_id, trigger in zip(trigger_ids, triggers)
+        ])
+        return trigger_ids
     
     async def get_pending_webhook_triggers(self, node_id: Optional[str] = None) -> List[WebhookTrigger]:
         """Get pending webhook triggers."""
         triggers = []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             if node_id:
-                query = "SELECT * FROM webhook_triggers WHERE node_id = ? AND processed = FALSE ORDER BY timestamp"
+                query = "SELECT id, node_id, data, headers, timestamp FROM webhook_triggers WHERE node_id = ? AND processed = FALSE ORDER BY timestamp"
                 params = (node_id,)
             else:
-                query = "SELECT * FROM webhook_triggers WHERE processed = FALSE ORDER BY timestamp"
+                query = "SELECT id, node_id, data, headers, timestamp FROM webhook_triggers WHERE processed = FALSE ORDER BY timestamp"
                 params = ()
             
             async with db.execute(query, params) as cursor:
                 async for row in cursor:
                     triggers.append(WebhookTrigger(
                         node_id=row[1],
-                        data=json.loads(row[2]),
-                        headers=json.loads(row[3]) if row[3] else {},
-                        timestamp=datetime.fromisoformat(row[4])
+                        id=row[0],
+                        data=loads(row[2]),
+                        headers=loads(row[3]) if row[3] else {},
+                        timestamp=_from_ns(row[4])
                     ))
         return triggers
     
     async def mark_webhook_processed(self, trigger_id: str) -> None:
         """Mark a webhook trigger as processed."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             await db.execute("""
                 UPDATE webhook_triggers SET processed = TRUE WHERE id = ?
             """, (trigger_id,))
-            await db.commit()
     
     async def remove_node(self, node_id: str) -> None:
         """Remove a node and all its related data."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Remove in order to respect foreign key constraints
-            await db.execute("DELETE FROM symlinks WHERE node_instance_id IN (SELECT id FROM node_instances WHERE node_id = ?)", (node_id,))
-            await db.execute("DELETE FROM execution_logs WHERE node_id = ?", (node_id,))
-            await db.execute("DELETE FROM tail_states WHERE node_id = ?", (node_id,))
-            await db.execute("DELETE FROM webhook_triggers WHERE node_id = ?", (node_id,))
-            await db.execute("DELETE FROM dependencies WHERE dependent_node_id = ? OR dependency_node_id = ?", (node_id, node_id))
-            await db.execute("DELETE FROM node_values WHERE node_id = ?", (node_id,))
-            await db.execute("DELETE FROM node_instances WHERE node_id = ?", (node_id,))
-            await db.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
-            await db.commit() 
\ No newline at end of file
+        async with self._connection() as db:
+            # Related rows go with it via the nodes_remove_related trigger
+            await db.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
\ No newline at end of file
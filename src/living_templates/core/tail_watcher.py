@@ -1,15 +1,96 @@
 """Tail watcher for monitoring file changes."""
 
 import asyncio
+import logging
 import os
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
 
 from .models import TailState
 
+logger = logging.getLogger(__name__)
+
+# Lines kept in each file's buffer; older lines are dropped as new ones arrive
+MAX_BUFFER_LINES = 1000
+
+# Seconds between checks when polling without filesystem events
+POLL_INTERVAL = 0.5
+
+# Seconds between full checks of every file when driven by filesystem events,
+# as a safety net for filesystems that don't report changes (e.g. NFS)
+RESCAN_INTERVAL = 5.0
+
+# Seconds to wait after a change event before reading, so a burst of writes
+# is read and delivered to callbacks as one batch
+DEBOUNCE_INTERVAL = 0.05
+
+
+def _read_last_lines(f: BinaryIO, size: int, count: int, block_size: int = 64 * 1024) -> List[str]:
+    """Read the last lines of a file without reading all of it.
+    
+    Reads backwards from ``size`` in blocks until enough lines are found.
+    
+    Args:
+        f: File opened in binary mode
+        size: Size of the file
+        count: Number of lines to return
+        block_size: Bytes read per step
+        
+    Returns:
+        Up to ``count`` lines, each ending in a newline except possibly the last
+    """
+    if count <= 0:
+        return []
+    
+    data = b""
+    pos = size
+    # One more newline than lines wanted, so the first kept line is complete
+    while pos > 0 and data.count(b"\n") <= count:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        data = f.read(step) + data
+    
+    text = data.decode('utf-8', errors='replace').replace('\r\n', '\n')
+    parts = text.split('\n')
+    lines = [part + '\n' for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    if pos > 0:
+        # Drop the partial line the first block started in
+        lines = lines[1:]
+    return lines[-count:]
+
+
+class _TailEventHandler(FileSystemEventHandler):
+    """Forwards filesystem events for tailed files to the watcher's loop."""
+    
+    def __init__(self, watcher: 'TailWatcher', loop: asyncio.AbstractEventLoop):
+        """Initialize event handler.
+        
+        Args:
+            watcher: Tail watcher to notify
+            loop: Event loop the watcher runs on
+        """
+        self.watcher = watcher
+        self.loop = loop
+    
+    def dispatch(self, event: FileSystemEvent) -> None:
+        """Mark watched files touched by an event as changed."""
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path in self.watcher.watched_files:
+                self.loop.call_soon_threadsafe(self.watcher._mark_changed, path)
+
 
 class TailWatcher:
-    """Watches files for new content and processes it."""
+    """Watches files for new content and processes it.
+    
+    Files are checked when the OS reports a change to them, plus a periodic
+    full check. If filesystem events are unavailable it falls back to polling.
+    """
     
     def __init__(self):
         """Initialize tail watcher."""
@@ -17,6 +98,27 @@ class TailWatcher:
         self.callbacks: Dict[str, List[Callable]] = {}
         self.running = False
         self.watch_task: Optional[asyncio.Task] = None
+        self._observer: Optional[Observer] = None
+        self._handler: Optional[_TailEventHandler] = None
+        self._watched_dirs: Set[str] = set()
+        self._changed: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        # Caller-supplied path -> resolved path, so repeat lookups skip realpath
+        self._resolved: Dict[str, str] = {}
+    
+    def _resolve(self, file_path: str) -> str:
+        """Resolve a watched file path, caching the result.
+        
+        Args:
+            file_path: Path as given by the caller
+            
+        Returns:
+            Canonical path used as the watch key
+        """
+        path = self._resolved.get(file_path)
+        if path is None:
+            path = self._resolved[file_path] = os.path.realpath(file_path)
+        return path
     
     def add_file_watch(
         self, 
@@ -35,39 +137,42 @@ class TailWatcher:
             tail_lines: Number of lines to keep in buffer
             separator: Line separator
         """
-        path = str(Path(file_path).resolve())
+        path = self._resolve(file_path)
         
         if path not in self.watched_files:
             # Initialize tail state
             state = TailState(
                 node_id=node_id,
                 file_path=path,
-                buffer=[]
+                buffer=deque(maxlen=MAX_BUFFER_LINES)
             )
             
             # Read initial content if file exists
-            if Path(path).exists():
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        f.seek(0, 2)  # Seek to end
-                        state.last_position = f.tell()
-                        
-                        # Get file inode for rotation detection
-                        stat = os.stat(path)
-                        state.last_inode = stat.st_ino
-                        
-                        # Read last N lines for buffer
-                        f.seek(0)
-                        lines = f.readlines()
-                        state.buffer = [line.rstrip(separator) for line in lines[-tail_lines:]]
-                        
-                except (IOError, OSError) as e:
-                    # File might be locked or permission denied
-                    state.last_position = 0
-                    state.buffer = []
+            try:
+                with open(path, 'rb') as f:
+                    # Get end position and file inode for rotation detection
+                    stat = os.fstat(f.fileno())
+                    state.last_position = stat.st_size
+                    state.last_inode = stat.st_ino
+                    
+                    # Read last N lines for buffer
+                    lines = _read_last_lines(f, stat.st_size, tail_lines)
+                    if lines and not lines[-1].endswith('\n'):
+                        # Unterminated last line; the next write completes it
+                        state._partial = lines.pop().encode('utf-8')
+                    state.buffer.extend(line.rstrip(separator) for line in lines)
+                    
+            except FileNotFoundError:
+                # Not created yet; it is picked up once it appears
+                pass
+            except (IOError, OSError) as e:
+                # File might be locked or permission denied
+                state.last_position = 0
+                state.buffer.clear()
             
             self.watched_files[path] = state
             self.callbacks[path] = []
+            self._watch_directory(os.path.dirname(path))
         
         # Add callback for this node
         if callback not in self.callbacks[path]:
@@ -80,7 +185,7 @@ class TailWatcher:
             node_id: ID of the node
             file_path: Path to the file
         """
-        path = str(Path(file_path).resolve())
+        path = self._resolve(file_path)
         
         if path in self.watched_files:
             # Remove callbacks for this node
@@ -90,6 +195,9 @@ class TailWatcher:
             if path in self.callbacks:
                 del self.callbacks[path]
             del self.watched_files[path]
+            self._resolved = {
+                raw: resolved for raw, resolved in self._resolved.items() if resolved != path
+            }
     
     async def start_watching(self) -> None:
         """Start the tail watching process."""
@@ -97,6 +205,22 @@ class TailWatcher:
             return
         
         self.running = True
+        self._wakeup = asyncio.Event()
+        
+        observer = Observer()
+        observer.daemon = True
+        try:
+            self._handler = _TailEventHandler(self, asyncio.get_running_loop())
+            self._observer = observer
+            for dir_path in {os.path.dirname(path) for path in self.watched_files}:
+                self._watch_directory(dir_path)
+            observer.start()
+        except OSError as e:
+            # e.g. inotify watch limit reached
+            logger.warning("Filesystem events unavailable, polling tailed files: %s", e)
+            self._observer = None
+            self._watched_dirs.clear()
+        
         self.watch_task = asyncio.create_task(self._watch_loop())
     
     async def stop_watching(self) -> None:
@@ -109,22 +233,61 @@ class TailWatcher:
             except asyncio.CancelledError:
                 pass
             self.watch_task = None
+        
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1)
+            self._observer = None
+            self._watched_dirs.clear()
+    
+    def _watch_directory(self, dir_path: str) -> None:
+        """Subscribe to events for a directory containing tailed files.
+        
+        Directories rather than files are watched so rotated and recreated
+        files are still seen.
+        """
+        if self._observer is None or dir_path in self._watched_dirs:
+            return
+        try:
+            self._observer.schedule(self._handler, dir_path, recursive=False)
+        except OSError:
+            # Directory doesn't exist (yet); the periodic full check covers it
+            return
+        self._watched_dirs.add(dir_path)
+    
+    def _mark_changed(self, file_path: str) -> None:
+        """Queue a file for checking and wake the watch loop."""
+        self._changed.add(file_path)
+        if self._wakeup is not None:
+            self._wakeup.set()
     
     async def _watch_loop(self) -> None:
         """Main watch loop."""
         while self.running:
             try:
-                for file_path in list(self.watched_files.keys()):
-                    await self._check_file_changes(file_path)
+                if self._observer is None:
+                    # Polling: check everything on every tick
+                    await asyncio.sleep(POLL_INTERVAL)
+                    file_paths = list(self.watched_files)
+                else:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), RESCAN_INTERVAL)
+                        await asyncio.sleep(DEBOUNCE_INTERVAL)
+                        file_paths = list(self._changed)
+                    except asyncio.TimeoutError:
+                        file_paths = list(self.watched_files)
+                    self._wakeup.clear()
+                    self._changed.clear()
                 
-                # Sleep between checks
-                await asyncio.sleep(0.5)  # Check every 500ms
+                for file_path in file_paths:
+                    if file_path in self.watched_files:
+                        await self._check_file_changes(file_path)
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 # Log error but continue watching
-                print(f"Error in tail watcher: {e}")
+                logger.error("Error in tail watcher: %s", e)
                 await asyncio.sleep(1)
     
     async def _check_file_changes(self, file_path: str) -> None:
@@ -134,57 +297,48 @@ class TailWatcher:
             file_path: Path to the file to check
         """
         state = self.watched_files[file_path]
-        path = Path(file_path)
         
         try:
-            if not path.exists():
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
                 # File doesn't exist, reset state
                 state.last_position = 0
                 state.last_inode = None
                 return
             
-            stat = os.stat(file_path)
             current_inode = stat.st_ino
             current_size = stat.st_size
             
+            # Unchanged since the last check; nothing to read
+            if current_inode == state.last_inode and current_size == state.last_position:
+                return
+            
             # Check for file rotation (inode changed)
             if state.last_inode is not None and current_inode != state.last_inode:
                 # File was rotated, start from beginning
                 state.last_position = 0
                 state.last_inode = current_inode
-                state.buffer = []
+                state.buffer.clear()
+                state._partial = b""
             
             # Check if file grew
             if current_size > state.last_position:
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                with open(file_path, 'rb') as f:
                     f.seek(state.last_position)
-                    new_content = f.read()
+                    chunk = f.read()
                     state.last_position = f.tell()
                     state.last_inode = current_inode
                 
-                if new_content:
-                    # Split into lines
-                    lines = new_content.split('\n')
-                    
-                    # First line might be continuation of previous line
-                    if state.buffer and lines:
-                        state.buffer[-1] += lines[0]
-                        lines = lines[1:]
-                    
-                    # Add new complete lines to buffer
-                    new_lines = []
-                    for line in lines[:-1]:  # All but last (might be incomplete)
-                        state.buffer.append(line)
-                        new_lines.append(line)
-                    
-                    # Keep buffer size limited
-                    max_lines = 1000  # Reasonable limit
-                    if len(state.buffer) > max_lines:
-                        state.buffer = state.buffer[-max_lines:]
-                    
-                    # Handle last line (might be incomplete)
-                    if lines and lines[-1]:
-                        state.buffer.append(lines[-1])
+                if chunk:
+                    # Split into lines; the last piece is incomplete until a newline arrives
+                    pieces = (state._partial + chunk).split(b'\n')
+                    state._partial = pieces.pop()
+                    new_lines = [
+                        (piece[:-1] if piece.endswith(b'\r') else piece).decode('utf-8', errors='replace')
+                        for piece in pieces
+                    ]
+                    state.buffer.extend(new_lines)
                     
                     # Notify callbacks of new lines
                     if new_lines and file_path in self.callbacks:
@@ -195,12 +349,13 @@ class TailWatcher:
                                 else:
                                     callback(state.node_id, new_lines)
                             except Exception as e:
-                                print(f"Error in tail callback: {e}")
+                                logger.error("Error in tail callback: %s", e)
             
             elif current_size < state.last_position:
                 # File was truncated, start from beginning
                 state.last_position = 0
-                state.buffer = []
+                state.buffer.clear()
+                state._partial = b""
         
         except (IOError, OSError) as e:
             # File might be locked, moved, or permission denied
@@ -216,9 +371,10 @@ class TailWatcher:
         Returns:
             List of lines in buffer
         """
-        path = str(Path(file_path).resolve())
+        # Don't cache lookups for files that were never watched
+        path = self._resolved.get(file_path) or os.path.realpath(file_path)
         if path in self.watched_files:
-            return self.watched_files[path].buffer.copy()
+            return list(self.watched_files[path].buffer)
         return []
     
     def get_watched_files(self) -> List[str]:
@@ -1,29 +1,87 @@
 """Template engine for Living Templates."""
 
+import functools
+import hashlib
+import mmap
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 import jinja2
 
+# Number of compiled templates kept per engine
+TEMPLATE_CACHE_SIZE = 256
+
+# Files at least this large are read through mmap; smaller ones aren't worth the setup
+MMAP_THRESHOLD = 16 * 1024
+
+
+def _read_text(file_path: str, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """Read a UTF-8 text file with universal newlines, like Path.read_text.
+    
+    Large files are decoded straight from a read-only memory map instead of
+    being copied into a bytes object first.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ""
+        if size < mmap_threshold:
+            content = f.read().decode('utf-8')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    content = str(view, 'utf-8')
+    
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+# Directives now() renders with datetime instead of the per-second cache: %f
+# changes within a second, and the zone directives render empty for a naive
+# datetime but are filled in by time.strftime
+_DATETIME_DIRECTIVES = ('%f', '%z', '%:z', '%Z')
+
+
+@functools.lru_cache(maxsize=16)
+def _format_time(format_str: str, epoch_seconds: int) -> str:
+    """Format a whole-second timestamp; cached so renders within a second share it."""
+    return time.strftime(format_str, time.localtime(epoch_seconds))
+
 
 class TemplateEngine:
     """Template engine with custom filters and functions."""
     
-    def __init__(self):
-        """Initialize template engine."""
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """Initialize template engine.
+        
+        Args:
+            cache_dir: Directory to keep compiled template bytecode in, so
+                templates aren't recompiled after a restart. Disabled if None.
+        """
         self.env = jinja2.Environment(
             loader=jinja2.BaseLoader(),
             autoescape=False,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=(
+                jinja2.FileSystemBytecodeCache(str(cache_dir)) if cache_dir is not None else None
+            )
         )
         
         # Add custom filters and functions
         self.env.filters['read_file'] = self._read_file_filter
         self.env.globals['now'] = self._now_function
         self.env.globals['env'] = self._env_function
+        
+        # Compiled templates keyed by source, so re-renders skip parsing
+        self._compile = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self._load_template)
+        
+        # read_file results: path -> ((mtime_ns, size), content)
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
     
     def render(self, template_content: str, context: Dict[str, Any]) -> str:
         """Render template with given context.
@@ -35,20 +93,50 @@ class TemplateEngine:
         Returns:
             Rendered template content
         """
-        template = self.env.from_string(template_content)
+        template = self._compile(template_content)
         return template.render(**context)
     
+    def _load_template(self, template_content: str) -> jinja2.Template:
+        """Compile a template, going through the bytecode cache if enabled.
+        
+        Same as ``env.from_string``, but looks the compiled code up in the
+        bytecode cache under the hash of the source first.
+        """
+        bcc = self.env.bytecode_cache
+        if bcc is None:
+            return self.env.from_string(template_content)
+        
+        name = hashlib.sha256(template_content.encode('utf-8')).hexdigest()
+        bucket = bcc.get_bucket(self.env, name, None, template_content)
+        if bucket.code is None:
+            bucket.code = self.env.compile(template_content)
+            bcc.set_bucket(bucket)
+        return self.env.template_class.from_code(
+            self.env, bucket.code, self.env.make_globals(None), None
+        )
+    
     def _read_file_filter(self, file_path: str) -> str:
         """Jinja2 filter to read file contents.
         
         Usage: {{ "path/to/file.txt" | read_file }}
+        
+        Contents are cached and only re-read when the file's mtime or size
+        changes.
         """
         try:
-            path = Path(file_path)
-            if path.exists():
-                return path.read_text(encoding='utf-8')
-            else:
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
                 return f"<!-- File not found: {file_path} -->"
+            
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._file_cache.get(file_path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            content = _read_text(file_path)
+            self._file_cache[file_path] = (key, content)
+            return content
         except Exception as e:
             return f"<!-- Error reading file {file_path}: {e} -->"
     
@@ -57,7 +145,11 @@ class TemplateEngine:
         
         Usage: {{ now() }} or {{ now("%Y-%m-%d") }}
         """
-        return datetime.now().strftime(format_str)
+        if any(directive in format_str for directive in _DATETIME_DIRECTIVES):
+            # Sub-second output can't be shared across a second, and zone
+            # directives must keep rendering like the naive datetime does
+            return datetime.now().strftime(format_str)
+        return _format_time(format_str, int(time.time()))
     
     def _env_function(self, var_name: str, default: str = "") -> str:
         """Jinja2 function to get environment variable.
@@ -2,15 +2,33 @@
 
 import asyncio
 import json
+import logging
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
+import aiohttp
 import click
 from aiohttp import web
 
 from .client import LivingTemplatesClient
 
+# Maximum number of queued webhooks forwarded to the daemon in one request
+WEBHOOK_BATCH_SIZE = 100
+# Maximum number of webhooks waiting to be forwarded; further requests get a 503
+WEBHOOK_QUEUE_SIZE = 10000
+# Delay before re-sending a batch the daemon didn't take, doubled per attempt up to the maximum
+WEBHOOK_RETRY_DELAY = 0.5
+WEBHOOK_RETRY_MAX_DELAY = 30.0
+# Attempts before a batch the daemon keeps failing with a server error is dropped
+WEBHOOK_MAX_ATTEMPTS = 5
+# Seconds stop() waits for queued webhooks to reach the daemon
+WEBHOOK_DRAIN_TIMEOUT = 10.0
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
 
 class WebhookServer:
     """Standalone webhook server that communicates with Living Templates daemon."""
@@ -29,6 +47,9 @@ class WebhookServer:
         self.app = web.Application()
         self.runner = None
         self.site = None
+        self._client: Optional[LivingTemplatesClient] = None
+        self._queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue(WEBHOOK_QUEUE_SIZE)
+        self._forward_task: Optional[asyncio.Task] = None
         
         # Setup routes
         self.app.router.add_post('/webhook/{node_id}', self._handle_webhook)
@@ -37,18 +58,67 @@ class WebhookServer:
     
     async def start(self) -> None:
         """Start the webhook server."""
+        await self._connect()
         self.runner = web.AppRunner(self.app)
         await self.runner.setup()
         self.site = web.TCPSite(self.runner, 'localhost', self.port)
         await self.site.start()
+        self._forward_task = asyncio.create_task(self._forward_webhooks())
         print(f"Webhook server started on http://localhost:{self.port}")
     
     async def stop(self) -> None:
-        """Stop the webhook server."""
+        """Stop the webhook server.
+        
+        New webhooks are refused first, then queued ones are given up to
+        ``WEBHOOK_DRAIN_TIMEOUT`` seconds to reach the daemon.
+        """
         if self.site:
             await self.site.stop()
+        if self._forward_task:
+            try:
+                await asyncio.wait_for(self._queue.join(), WEBHOOK_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Stopping with webhooks not forwarded to the daemon (%d still queued)",
+                    self._queue.qsize()
+                )
+            self._forward_task.cancel()
+            try:
+                await self._forward_task
+            except asyncio.CancelledError:
+                pass
+            self._forward_task = None
         if self.runner:
             await self.runner.cleanup()
+        await self._disconnect()
+    
+    async def _connect(self) -> None:
+        """Open the persistent client used for all daemon requests."""
+        client = LivingTemplatesClient(self.daemon_host, self.daemon_port)
+        await client.__aenter__()
+        self._client = client
+    
+    async def _disconnect(self) -> None:
+        """Close the persistent daemon client."""
+        if self._client:
+            await self._client.__aexit__(None, None, None)
+            self._client = None
+    
+    async def _call_daemon(self, call: Callable[[LivingTemplatesClient], Awaitable[T]]) -> T:
+        """Run a client call, rebuilding the connection once if it has dropped.
+        
+        Args:
+            call: Coroutine function taking the client
+            
+        Returns:
+            Result of the call
+        """
+        try:
+            return await call(self._client)
+        except (ConnectionError, aiohttp.ClientConnectionError):
+            await self._disconnect()
+            await self._connect()
+            return await call(self._client)
     
     async def _handle_webhook(self, request: web.Request) -> web.Response:
         """Handle incoming webhook requests."""
@@ -59,6 +129,8 @@ class WebhookServer:
             content_type = request.headers.get('Content-Type', '')
             if content_type.startswith('application/json'):
                 data = await request.json()
+                if not isinstance(data, dict):
+                    return web.json_response({"error": "Webhook body must be a JSON object"}, status=400)
             else:
                 # For non-JSON, store as raw text
                 text = await request.text()
@@ -75,29 +147,89 @@ class WebhookServer:
                 "timestamp": str(asyncio.get_event_loop().time())
             }
             
-            # Forward to daemon
-            async with LivingTemplatesClient(self.daemon_host, self.daemon_port) as client:
-                if not await client.is_daemon_running():
-                    return web.json_response(
-                        {"error": "Living Templates daemon is not running"}, 
-                        status=503
-                    )
-                
-                await client.trigger_webhook(node_id, webhook_data)
+            # Hand off to the forwarding task; the caller doesn't wait on the daemon
+            try:
+                self._queue.put_nowait((node_id, webhook_data))
+            except asyncio.QueueFull:
+                return web.json_response(
+                    {"error": "Too many webhooks waiting for the daemon"},
+                    status=503,
+                    headers={"Retry-After": "1"}
+                )
             
-            return web.json_response({"status": "success", "node_id": node_id})
+            return web.json_response({"status": "accepted", "node_id": node_id}, status=202)
             
         except json.JSONDecodeError:
             return web.json_response({"error": "Invalid JSON"}, status=400)
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
     
+    async def _forward_webhooks(self) -> None:
+        """Forward queued webhooks to the daemon in batches."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < WEBHOOK_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self._forward_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _forward_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Send a batch to the daemon, retrying with backoff until it is taken.
+        
+        While the daemon is unreachable the batch is retried indefinitely;
+        the bounded queue pushes back on callers meanwhile. A batch failing
+        with a server error is dropped after ``WEBHOOK_MAX_ATTEMPTS``
+        attempts. A batch rejected as invalid (a 4xx response) is resent
+        one webhook at a time, so only the invalid webhooks are dropped.
+        
+        Args:
+            batch: ``(node_id, webhook_data)`` pairs
+        """
+        delay = WEBHOOK_RETRY_DELAY
+        attempts = 0
+        while True:
+            try:
+                await self._call_daemon(lambda client: client.trigger_webhooks_batch(batch))
+                return
+            except aiohttp.ClientResponseError as e:
+                if e.status < 500:
+                    if len(batch) > 1:
+                        for item in batch:
+                            await self._forward_batch([item])
+                    else:
+                        logger.error("Daemon rejected webhook for node %s: %s", batch[0][0], e)
+                    return
+                
+                attempts += 1
+                if attempts >= WEBHOOK_MAX_ATTEMPTS:
+                    logger.error(
+                        "Dropping %d webhook(s) after %d failed attempts: %s",
+                        len(batch), attempts, e
+                    )
+                    return
+                error = e
+            except Exception as e:
+                error = e
+            
+            logger.warning(
+                "Failed to forward %d webhook(s) to daemon, retrying in %.1fs: %s",
+                len(batch), delay, error
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WEBHOOK_RETRY_MAX_DELAY)
+    
     async def _health_check(self, request: web.Request) -> web.Response:
         """Health check endpoint."""
         # Check if daemon is reachable
         try:
-            async with LivingTemplatesClient(self.daemon_host, self.daemon_port) as client:
-                daemon_running = await client.is_daemon_running()
+            daemon_running = await self._call_daemon(lambda client: client.is_daemon_running())
             
             return web.json_response({
                 "status": "healthy",
@@ -115,24 +247,23 @@ class WebhookServer:
     async def _list_webhooks(self, request: web.Request) -> web.Response:
         """List available webhook nodes."""
         try:
-            async with LivingTemplatesClient(self.daemon_host, self.daemon_port) as client:
-                if not await client.is_daemon_running():
-                    return web.json_response(
-                        {"error": "Living Templates daemon is not running"}, 
-                        status=503
-                    )
-                
-                nodes = await client.list_nodes()
-                webhook_nodes = [
-                    node for node in nodes 
-                    if node.get("node_type") == "webhook"
-                ]
-                
-                return web.json_response({
-                    "webhook_nodes": webhook_nodes,
-                    "base_url": f"http://localhost:{self.port}/webhook"
-                })
-                
+            if not await self._call_daemon(lambda client: client.is_daemon_running()):
+                return web.json_response(
+                    {"error": "Living Templates daemon is not running"}, 
+                    status=503
+                )
+            
+            nodes = await self._call_daemon(lambda client: client.list_nodes())
+            webhook_nodes = [
+                node for node in nodes 
+                if node.get("node_type") == "webhook"
+            ]
+            
+            return web.json_response({
+                "webhook_nodes": webhook_nodes,
+                "base_url": f"http://localhost:{self.port}/webhook"
+            })
+            
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
 
@@ -0,0 +1,63 @@
+"""Shared fixtures for Living Templates tests."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from living_templates.core.daemon import LivingTemplatesDaemon
+from living_templates.core.template_engine import TemplateEngine
+
+
+@pytest.fixture
+def fast_tmp_dir():
+    """A temporary directory on tmpfs where available, so SQLite never hits disk."""
+    base = '/dev/shm' if sys.platform == 'linux' and os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(dir=base) as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+async def daemon(fast_tmp_dir):
+    """An initialized daemon using a temporary config directory."""
+    daemon = LivingTemplatesDaemon(fast_tmp_dir)
+    await daemon.initialize()
+    yield daemon
+    # The daemon is never started, so stop() would be a no-op; release what
+    # initialize() and the tests used directly
+    daemon._render_pool.shutdown(wait=True)
+    await daemon.db.close()
+
+
+@pytest.fixture
+def template_content():
+    """Config of a template node greeting its ``name`` input."""
+    return """---
+schema_version: "1.0"
+node_type: template
+template_engine: jinja2
+inputs:
+  name:
+    type: string
+    default: "Test"
+outputs:
+  - output.txt
+---
+Hello, {{ name }}!
+"""
+
+
+@pytest.fixture
+def template_file(tmp_path, template_content):
+    """A config file holding ``template_content``, as a resolved path."""
+    path = tmp_path / "test-template.yaml"
+    path.write_text(template_content)
+    return path.resolve()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """A template engine shared by all tests."""
+    return TemplateEngine()
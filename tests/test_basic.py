@@ -1,7 +1,6 @@
 """Basic tests for Living Templates."""
 
 import asyncio
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -9,7 +8,7 @@ import pytest
 from living_templates.core.config import FrontmatterParser
 from living_templates.core.daemon import LivingTemplatesDaemon
 from living_templates.core.models import NodeType
-from living_templates.core.template_engine import TemplateEngine
+from living_templates.core.template_engine import _read_text
 
 
 def test_frontmatter_parser():
@@ -39,10 +38,8 @@ Hello, {{ name }}!
     assert "Hello, {{ name }}!" in template_content
 
 
-def test_template_engine():
+def test_template_engine(engine):
     """Test template rendering."""
-    engine = TemplateEngine()
-    
     template = "Hello, {{ name }}! Today is {{ now('%Y-%m-%d') }}."
     context = {"name": "Isaac"}
     
@@ -52,82 +49,150 @@ def test_template_engine():
     assert "Today is" in result
 
 
-def test_template_engine_read_file_filter():
-    """Test the read_file filter."""
-    engine = TemplateEngine()
+def test_template_engine_now_zone_directives(engine):
+    """Test that now() renders zone directives like a naive datetime."""
+    result = engine.render("[{{ now('%z|%Z') }}]", {})
     
+    assert result == "[|]"
+
+
+def test_template_engine_read_file_filter(engine, tmp_path):
+    """Test the read_file filter."""
     # Create a temporary file
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-        f.write("Test content")
-        temp_path = f.name
+    temp_path = tmp_path / "test.txt"
+    temp_path.write_text("Test content")
     
-    try:
-        template = f"Content: {{{{ '{temp_path}' | read_file }}}}"
-        result = engine.render(template, {})
-        
-        assert "Content: Test content" in result
-    finally:
-        Path(temp_path).unlink()
+    template = f"Content: {{{{ '{temp_path}' | read_file }}}}"
+    result = engine.render(template, {})
+    
+    assert "Content: Test content" in result
+
+
+def test_read_text_mmap(tmp_path):
+    """Test reading files through mmap matches a plain read."""
+    temp_path = tmp_path / "test.txt"
+    temp_path.write_bytes("line one\r\nline two – ünïcode\n".encode('utf-8'))
+    
+    expected = temp_path.read_text(encoding='utf-8')
+    assert _read_text(str(temp_path), mmap_threshold=0) == expected
+    assert _read_text(str(temp_path)) == expected
 
 
 @pytest.mark.asyncio
-async def test_daemon_initialization():
+async def test_daemon_initialization(daemon):
     """Test daemon initialization."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config_dir = Path(temp_dir)
-        daemon = LivingTemplatesDaemon(config_dir)
-        
-        await daemon.initialize()
-        
-        # Check that directories were created
-        assert (config_dir / "store").exists()
-        assert daemon.config_manager.db_path.exists()
+    # Check that directories were created
+    assert daemon.config_manager.store_path.exists()
+    assert daemon.config_manager.db_path.exists()
 
 
 @pytest.mark.asyncio
-async def test_node_registration():
+async def test_node_registration(daemon, tmp_path, template_file):
     """Test node registration and template creation."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config_dir = Path(temp_dir)
-        daemon = LivingTemplatesDaemon(config_dir)
-        await daemon.initialize()
-        
-        # Create a test template file
-        template_content = """---
+    # File I/O runs in the default executor so the test doesn't block the loop
+    loop = asyncio.get_running_loop()
+    
+    # Register the node
+    node_id = await daemon.register_node(template_file)
+    assert node_id is not None
+    
+    # Create an instance
+    output_path = tmp_path / "output.txt"
+    instance_id = await daemon.create_instance(
+        node_id,
+        str(output_path),
+        {"name": "Isaac"}
+    )
+    
+    assert instance_id is not None
+    assert output_path.exists()
+    
+    # Check the content
+    content = await loop.run_in_executor(None, output_path.read_text)
+    assert "Hello, Isaac!" in content
+
+
+@pytest.mark.asyncio
+async def test_register_nodes(daemon, tmp_path):
+    """Test registering several nodes at once."""
+    loop = asyncio.get_running_loop()
+    template_files = []
+    for i in range(10):
+        template_file = tmp_path / f"template-{i}.yaml"
+        await loop.run_in_executor(None, template_file.write_text, f"""---
 schema_version: "1.0"
 node_type: template
-template_engine: jinja2
-inputs:
-  name:
-    type: string
-    default: "Test"
 outputs:
   - output.txt
 ---
-Hello, {{ name }}!
-"""
-        
-        template_file = Path(temp_dir) / "test-template.yaml"
-        template_file.write_text(template_content)
-        
-        # Register the node
-        node_id = await daemon.register_node(template_file)
-        assert node_id is not None
+Template {i}
+""")
+        template_files.append(template_file)
+    
+    node_ids = await daemon.register_nodes(template_files)
+    assert len(set(node_ids)) == 10
+    
+    for i, node_id in enumerate(node_ids):
+        output_path = tmp_path / f"output-{i}.txt"
+        await daemon.create_instance(node_id, str(output_path), {})
+        content = await loop.run_in_executor(None, output_path.read_text)
+        assert content == f"Template {i}"
+
+
+@pytest.mark.asyncio
+async def test_config_change_rebuilds_instances(daemon, tmp_path, template_file, template_content):
+    """Test that editing a node's config file rebuilds its instances."""
+    loop = asyncio.get_running_loop()
+    node_id = await daemon.register_node(template_file)
+    output_path = tmp_path / "output.txt"
+    await daemon.create_instance(node_id, str(output_path), {"name": "Isaac"})
+    
+    # An event without a config change must not rebuild
+    await daemon.handle_file_change(node_id, str(template_file))
+    assert daemon.node_instances[node_id][0].build_count == 1
+    
+    # Edit the template and deliver the change event
+    await loop.run_in_executor(None, template_file.write_text, template_content.replace("Hello", "Goodbye"))
+    await daemon.handle_file_change(node_id, str(template_file))
+    
+    assert "Goodbye, Isaac!" in await loop.run_in_executor(None, output_path.read_text)
+    assert len(daemon.node_instances[node_id]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("drop_watches", [False, True])
+async def test_restart_restores_config_watch(
+    daemon, fast_tmp_dir, tmp_path, template_file, template_content, drop_watches
+):
+    """Test that config edits still reload a node after a daemon restart.
+    
+    With ``drop_watches`` the database has no persisted watches, as one
+    written before they were persisted.
+    """
+    loop = asyncio.get_running_loop()
+    node_id = await daemon.register_node(template_file)
+    output_path = tmp_path / "output.txt"
+    await daemon.create_instance(node_id, str(output_path), {"name": "Isaac"})
+    
+    if drop_watches:
+        await daemon.db.remove_watches(await daemon.db.get_watches())
+    
+    restarted = LivingTemplatesDaemon(fast_tmp_dir)
+    try:
+        await restarted.initialize()
+        assert len(restarted.node_instances[node_id]) == 1
         
-        # Create an instance
-        output_path = Path(temp_dir) / "output.txt"
-        instance_id = await daemon.create_instance(
-            node_id,
-            str(output_path),
-            {"name": "Isaac"}
-        )
+        config_path = str(template_file)
+        assert node_id in restarted.file_watcher.get_watched_files()[config_path]
+        assert (config_path, node_id) in await restarted.db.get_watches()
         
-        assert instance_id is not None
-        assert output_path.exists()
+        await loop.run_in_executor(None, template_file.write_text, template_content.replace("Hello", "Goodbye"))
+        await restarted.handle_file_change(node_id, config_path)
         
-        # Check the content
-        content = output_path.read_text()
-        assert "Hello, Isaac!" in content
+        assert "Goodbye, Isaac!" in await loop.run_in_executor(None, output_path.read_text)
+    finally:
+        restarted._render_pool.shutdown(wait=True)
+        await restarted.db.close()
 
 
 if __name__ == "__main__":
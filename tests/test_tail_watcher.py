@@ -0,0 +1,34 @@
+"""Tests for tailing files."""
+
+import asyncio
+import os
+
+from living_templates.core.tail_watcher import TailWatcher
+
+
+def test_append_across_partial_line(tmp_path):
+    """Test that lines appended after an unterminated line are all reported once complete."""
+    log_path = tmp_path / "app.log"
+    log_path.write_bytes(b"a\nb\npart")
+    path = os.path.realpath(log_path)
+    
+    reported = []
+    watcher = TailWatcher()
+    watcher.add_file_watch("node", str(log_path), lambda node_id, lines: reported.append(lines))
+    
+    # The unterminated line stays out of the buffer until it is completed
+    assert watcher.get_buffer(str(log_path)) == ["a", "b"]
+    
+    with open(log_path, 'ab') as f:
+        f.write(b"ial\nc\nd\n")
+    asyncio.run(watcher._check_file_changes(path))
+    
+    assert reported == [["partial", "c", "d"]]
+    assert watcher.get_buffer(str(log_path)) == ["a", "b", "partial", "c", "d"]
+    
+    with open(log_path, 'ab') as f:
+        f.write(b"e\r\nf")
+    asyncio.run(watcher._check_file_changes(path))
+    
+    assert reported[-1] == ["e"]
+    assert watcher.get_buffer(str(log_path))[-1] == "e"
@@ -0,0 +1,169 @@
+"""Tests for forwarding webhooks to the daemon."""
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from living_templates import webhook_server
+from living_templates.webhook_server import WebhookServer
+
+
+class FakeDaemon:
+    """Daemon API stub recording the webhooks it accepts."""
+    
+    def __init__(self, failures: int = 0):
+        """Initialize the stub.
+        
+        Args:
+            failures: Number of batch requests answered with a 500 first
+        """
+        self.failures = failures
+        self.requests = 0
+        self.accepted = []
+        self.runner = None
+    
+    async def _trigger_webhooks(self, request: web.Request) -> web.Response:
+        """Batch endpoint: fail, reject batches naming node ``bad``, or accept."""
+        self.requests += 1
+        if self.failures:
+            self.failures -= 1
+            return web.json_response({"error": "unavailable"}, status=500)
+        
+        items = (await request.json())["webhooks"]
+        if any(item["node_id"] == "bad" for item in items):
+            return web.json_response({"error": "Invalid webhook"}, status=400)
+        self.accepted.extend(item["node_id"] for item in items)
+        return web.json_response({"status": "success", "count": len(items)})
+    
+    async def start(self) -> int:
+        """Serve on a free local port and return it."""
+        app = web.Application()
+        app.router.add_post('/api/webhooks', self._trigger_webhooks)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, 'localhost', 0).start()
+        return self.runner.addresses[0][1]
+    
+    async def stop(self) -> None:
+        """Stop serving."""
+        await self.runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """Retry failed forwards without waiting."""
+    monkeypatch.setattr(webhook_server, "WEBHOOK_RETRY_DELAY", 0.01)
+    monkeypatch.setattr(webhook_server, "WEBHOOK_DRAIN_TIMEOUT", 5.0)
+
+
+async def _post_webhooks(server: WebhookServer, node_ids, json=None):
+    """Post one webhook per node ID to a running server and return the statuses."""
+    port = server.runner.addresses[0][1]
+    statuses = []
+    async with aiohttp.ClientSession() as session:
+        for node_id in node_ids:
+            async with session.post(
+                f"http://localhost:{port}/webhook/{node_id}", json=json or {"value": node_id}
+            ) as resp:
+                statuses.append(resp.status)
+    return statuses
+
+
+async def _run(fake: FakeDaemon, node_ids, json=None):
+    """Send webhooks through a server forwarding to ``fake``, draining on stop."""
+    server = WebhookServer(0, 'localhost', await fake.start())
+    await server.start()
+    try:
+        return await _post_webhooks(server, node_ids, json)
+    finally:
+        await server.stop()
+        await fake.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried():
+    """Test that a batch the daemon fails is sent again and delivered."""
+    fake = FakeDaemon(failures=2)
+    
+    statuses = await _run(fake, ["a", "b", "c"])
+    
+    assert statuses == [202, 202, 202]
+    assert sorted(fake.accepted) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_server_errors_stop_being_retried(monkeypatch):
+    """Test that a batch failing with server errors is dropped instead of blocking the queue."""
+    monkeypatch.setattr(webhook_server, "WEBHOOK_MAX_ATTEMPTS", 2)
+    fake = FakeDaemon(failures=2)
+    server = WebhookServer(0, 'localhost', await fake.start())
+    await server.start()
+    try:
+        await _post_webhooks(server, ["a"])
+        await server._queue.join()
+        # The next webhook still goes through
+        await _post_webhooks(server, ["b"])
+    finally:
+        await server.stop()
+        await fake.stop()
+    
+    assert fake.requests == 3
+    assert fake.accepted == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_rejected_webhook_does_not_block_batch():
+    """Test that only the webhook the daemon rejects is dropped from a batch."""
+    fake = FakeDaemon()
+    server = WebhookServer(0, 'localhost', await fake.start())
+    # Queue a batch directly so all three are forwarded together
+    for node_id in ["a", "bad", "b"]:
+        server._queue.put_nowait((node_id, {"data": {}}))
+    await server.start()
+    try:
+        await server._queue.join()
+    finally:
+        await server.stop()
+        await fake.stop()
+    
+    assert fake.accepted == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_non_object_json_is_rejected():
+    """Test that a JSON body that isn't an object is refused before it is queued."""
+    fake = FakeDaemon()
+    
+    statuses = await _run(fake, ["a"], json=[1, 2])
+    
+    assert statuses == [400]
+    assert fake.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503(monkeypatch):
+    """Test that webhooks are refused once the forwarding queue is full."""
+    monkeypatch.setattr(webhook_server, "WEBHOOK_QUEUE_SIZE", 1)
+    monkeypatch.setattr(webhook_server, "WEBHOOK_DRAIN_TIMEOUT", 0.1)
+    server = WebhookServer(0, 'localhost', 1)
+    await server.start()
+    try:
+        # Nothing listens on the daemon port, so the first webhook is retried
+        # while the second fills the queue
+        statuses = await _post_webhooks(server, ["a", "b", "c"])
+    finally:
+        await server.stop()
+    
+    assert statuses == [202, 202, 503]
+
+
+@pytest.mark.asyncio
+async def test_daemon_rejects_malformed_webhooks(daemon):
+    """Test that the daemon refuses a batch with a malformed webhook and stores nothing."""
+    with pytest.raises(ValueError):
+        await daemon.trigger_webhooks([
+            {"node_id": "n", "webhook_data": {"data": {}}},
+            {"node_id": "n", "webhook_data": {"data": [1, 2]}},
+        ])
+    
+    assert await daemon.db.get_pending_webhook_triggers() == []